@@ -1,51 +1,52 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib
+matplotlib.use('Agg')  # 只保存图片, 不需要GUI后端
+import matplotlib.pyplot as plt
 import sys
 import os
-matplotlib.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
+# 图中文字全是ASCII, 只用matplotlib自带的DejaVu Sans, 避免查找/重建CJK字体缓存
+matplotlib.rcParams['font.family'] = 'sans-serif'
+matplotlib.rcParams['font.sans-serif'] = ['DejaVu Sans']
 matplotlib.rcParams['axes.unicode_minus'] = False
 
+# 固定的对比时间点 (小时)
+target_times = [7, 13, 19, 25]
+
+# 按最接近的时间点取行: 一次merge_asof代替每个时间点一次argsort
+def nearest_rows(df, time_col, times):
+    targets = pd.DataFrame({time_col: np.asarray(times, dtype=float)})
+    source = df.assign(**{time_col: df[time_col].astype(float)}).sort_values(time_col)
+    return pd.merge_asof(targets, source, on=time_col, direction='nearest')
+
 # 获取simulation文件夹路径（如果作为参数提供）
 simulation_folder = sys.argv[1] if len(sys.argv) > 1 else '.'
 simulation_csv_path = os.path.join(simulation_folder, 'simulation_output.csv')
 
 # 读取simulation数据 (从指定文件夹的simulation_output.csv文件)
 try:
-    df_sim_output = pd.read_csv(simulation_csv_path)
+    # 只解析用到的列 (pyarrow多线程解析器)
+    sim_columns = ['Time', 'virionOnlyInfected', 'dipOnlyInfected', 'bothInfected',
+                   'Percentage Susceptible Cells', 'GRID_SIZE']
+    df_sim_output = pd.read_csv(simulation_csv_path, usecols=sim_columns, engine='pyarrow')
     print("✅ Successfully loaded simulation data from simulation_output.csv")
     
+    # 从simulation_output.csv数据中提取对应时间点的数据 (一次merge_asof取最接近的时间点)
+    sim_rows = nearest_rows(df_sim_output, 'Time', target_times)
+    # 计算susceptible细胞数 (从百分比转换, GRID_SIZE从CSV文件读取)
+    sim_total_cells = sim_rows['GRID_SIZE'].to_numpy() ** 2
+    susceptible_percent = sim_rows['Percentage Susceptible Cells'].to_numpy()
+    
     # 从simulation_output.csv数据创建simulation数据
+    # 直接读取实际细胞数 (这些列已经是实际细胞数，不是百分比)
     data_simulation = {
-        'time': [7, 13, 19, 25],  # 固定的时间点
-        'virion_counts': [0, 0, 0, 0],  # 初始化
-        'dip_counts': [0, 0, 0, 0],  # 初始化
-        'both_infected_counts': [0, 0, 0, 0],  # 初始化
-        'susceptible_counts': [0, 0, 0, 0]  # 初始化
+        'time': target_times,  # 固定的时间点
+        'virion_counts': sim_rows['virionOnlyInfected'].astype(int).tolist(),
+        'dip_counts': sim_rows['dipOnlyInfected'].astype(int).tolist(),
+        'both_infected_counts': sim_rows['bothInfected'].astype(int).tolist(),
+        'susceptible_counts': (susceptible_percent * sim_total_cells / 100).astype(int).tolist()
     }
     
-    # 从simulation_output.csv数据中提取对应时间点的数据
-    for i, target_time in enumerate([7, 13, 19, 25]):
-        # 找到最接近的时间点
-        closest_row = df_sim_output.iloc[(df_sim_output['Time'] - target_time).abs().argsort()[:1]]
-        if not closest_row.empty:
-            # 直接读取实际细胞数 (这些列已经是实际细胞数，不是百分比)
-            virion_count = closest_row['virionOnlyInfected'].iloc[0]
-            dip_count = closest_row['dipOnlyInfected'].iloc[0]
-            both_count = closest_row['bothInfected'].iloc[0]
-            susceptible_percent = closest_row['Percentage Susceptible Cells'].iloc[0]
-            
-            # 计算susceptible细胞数 (从百分比转换)
-            grid_size = closest_row['GRID_SIZE'].iloc[0]  # 从CSV文件读取GRID_SIZE
-            total_cells = grid_size * grid_size
-            susceptible_count = int(susceptible_percent * total_cells / 100)
-            
-            data_simulation['virion_counts'][i] = int(virion_count)
-            data_simulation['dip_counts'][i] = int(dip_count)
-            data_simulation['both_infected_counts'][i] = int(both_count)
-            data_simulation['susceptible_counts'][i] = susceptible_count
-    
     print("📊 Simulation data loaded:")
     print(f"   Time points: {data_simulation['time']}")
     print(f"   Virion counts: {data_simulation['virion_counts']}")
@@ -65,41 +66,28 @@ except Exception as e:
 
 # 读取实验数据 (从CSV文件)
 try:
-    df_csv = pd.read_csv('infection_counts_by_time.csv')
+    exp_columns = ['time', 'virion_counts', 'dip_counts', 'both_infected_counts',
+                   'susceptible_counts', 'total_cells']
+    df_csv = pd.read_csv('infection_counts_by_time.csv', usecols=exp_columns, engine='pyarrow')
     print("✅ Successfully loaded experimental data from infection_counts_by_time.csv")
     
+    # 从CSV数据中提取对应时间点的数据 (一次merge_asof取最接近的时间点)
+    exp_rows = nearest_rows(df_csv, 'time', target_times)
+    # 实验数据的susceptible counts使用simulation的GRID_SIZE计算
+    # 使用公式: GRID_SIZE*GRID_SIZE - (total_cells - susceptible_counts)
+    # 其中total_cells是实验数据中的total_cells，susceptible_counts是实验数据中的susceptible_counts
+    exp_total_cells = exp_rows['total_cells'].to_numpy()
+    exp_susceptible = exp_rows['susceptible_counts'].to_numpy()
+    
     # 从CSV数据创建实验数据
     data_experimental = {
-        'time': [7, 13, 19, 25],  # 固定的时间点
-        'virion_counts': [0, 0, 0, 0],  # 初始化
-        'dip_counts': [0, 0, 0, 0],  # 初始化
-        'both_infected_counts': [0, 0, 0, 0],  # 初始化
-        'susceptible_counts': [0, 0, 0, 0]  # 初始化
+        'time': target_times,  # 固定的时间点
+        'virion_counts': exp_rows['virion_counts'].tolist(),
+        'dip_counts': exp_rows['dip_counts'].tolist(),
+        'both_infected_counts': exp_rows['both_infected_counts'].tolist(),
+        'susceptible_counts': (sim_total_cells - (exp_total_cells - exp_susceptible)).tolist()
     }
     
-    # 从CSV数据中提取对应时间点的数据
-    for i, target_time in enumerate([7, 13, 19, 25]):
-        # 找到最接近的时间点
-        closest_row = df_csv.iloc[(df_csv['time'] - target_time).abs().argsort()[:1]]
-        if not closest_row.empty:
-            data_experimental['virion_counts'][i] = closest_row['virion_counts'].iloc[0]
-            data_experimental['dip_counts'][i] = closest_row['dip_counts'].iloc[0]
-            data_experimental['both_infected_counts'][i] = closest_row['both_infected_counts'].iloc[0]
-            # 实验数据的susceptible counts使用simulation的GRID_SIZE计算
-            # 先读取simulation数据来获取GRID_SIZE
-            sim_closest_row = df_sim_output.iloc[(df_sim_output['Time'] - target_time).abs().argsort()[:1]]
-            if not sim_closest_row.empty:
-                grid_size = sim_closest_row['GRID_SIZE'].iloc[0]
-                total_cells = grid_size * grid_size
-                # 使用公式: GRID_SIZE*GRID_SIZE - (total_cells - susceptible_counts)
-                # 其中total_cells是实验数据中的total_cells，susceptible_counts是实验数据中的susceptible_counts
-                exp_total_cells = closest_row['total_cells'].iloc[0]
-                exp_susceptible = closest_row['susceptible_counts'].iloc[0]
-                data_experimental['susceptible_counts'][i] = total_cells - (exp_total_cells - exp_susceptible)
-            else:
-                # 如果找不到对应的simulation数据，使用原始值
-                data_experimental['susceptible_counts'][i] = closest_row['susceptible_counts'].iloc[0]
-    
     print("📊 Experimental data loaded:")
     print(f"   Time points: {data_experimental['time']}")
     print(f"   Virion counts: {data_experimental['virion_counts']}")
@@ -130,22 +118,10 @@ except Exception as e:
 df_experimental = pd.DataFrame(data_experimental)
 df_simulation = pd.DataFrame(data_simulation)
 
-# 计算log值 (避免log(0)，使用log(1)代替)
-def safe_log(x):
-    return np.log(np.maximum(x, 1))
-
-# 应用log转换
-for col in ['virion_counts', 'dip_counts', 'both_infected_counts', 'susceptible_counts']:
-    df_experimental[f'{col}_log'] = safe_log(df_experimental[col])
-    df_simulation[f'{col}_log'] = safe_log(df_simulation[col])
-
-# 创建对比图 - Log版本
-fig_log, axes_log = plt.subplots(2, 2, figsize=(15, 12))
-fig_log.suptitle('Experimental Data vs Simulation Results - Log Scale Comparison', fontsize=16, fontweight='bold')
-
-# 创建对比图 - 非Log版本
-fig_linear, axes_linear = plt.subplots(2, 2, figsize=(15, 12))
-fig_linear.suptitle('Experimental Data vs Simulation Results - Linear Scale Comparison', fontsize=16, fontweight='bold')
+# 四种细胞数 (Log版本直接对原始数值用symlog坐标轴, 不再单独计算log列)
+count_columns = ['virion_counts', 'dip_counts', 'both_infected_counts', 'susceptible_counts']
+exp_counts = df_experimental[count_columns].to_numpy()
+sim_counts = df_simulation[count_columns].to_numpy()
 
 # 颜色设置 - 按照用户要求
 colors = ['#d62728', '#ff7f0e', '#2ca02c', '#000000']  # 红色, 深黄色, 绿色, 黑色
@@ -156,190 +132,89 @@ labels = ['Experimental Data', 'Simulation Results']
 solid_line = '-'
 dashed_line = '--'
 
-# 1. Virion感染对比 - Log版本
-ax1_log = axes_log[0, 0]
-ax1_log.plot(df_experimental['time'], df_experimental['virion_counts_log'], 
-         color=colors[0], linewidth=3, 
-         label=labels[0], linestyle=solid_line)
-ax1_log.plot(df_simulation['time'], df_simulation['virion_counts_log'], 
-         color=colors[0], linewidth=3, 
-         label=labels[1], linestyle=dashed_line)
-ax1_log.set_title('Virion-Infected Cells (Log)', fontsize=24, fontweight='bold')
-ax1_log.set_xlabel('Time (hours)', fontsize=22)
-ax1_log.set_ylabel('Log(Cell Count)', fontsize=22)
-ax1_log.legend(fontsize=20)
-ax1_log.tick_params(axis='both', which='major', labelsize=20)
-ax1_log.grid(True, alpha=0.3)
-
-# 1. Virion感染对比 - 线性版本
-ax1_linear = axes_linear[0, 0]
-line1 = ax1_linear.plot(df_experimental['time'], df_experimental['virion_counts'], 
-         color=colors[0], linewidth=3, 
-         label=labels[0], linestyle=solid_line, marker='o', markersize=8)
-line2 = ax1_linear.plot(df_simulation['time'], df_simulation['virion_counts'], 
-         color=colors[0], linewidth=3, 
-         label=labels[1], linestyle=dashed_line, marker='s', markersize=8)
-
-# 添加数值标注
-for i, (x, y1, y2) in enumerate(zip(df_experimental['time'], df_experimental['virion_counts'], df_simulation['virion_counts'])):
-    ax1_linear.annotate(f'{int(y1)}', (x, y1), textcoords="offset points", xytext=(0,10), ha='center', fontsize=14, fontweight='bold')
-    ax1_linear.annotate(f'{int(y2)}', (x, y2), textcoords="offset points", xytext=(0,-15), ha='center', fontsize=14, fontweight='bold')
-
-ax1_linear.set_title('Virion-Infected Cells (Linear)', fontsize=24, fontweight='bold')
-ax1_linear.set_xlabel('Time (hours)', fontsize=22)
-ax1_linear.set_ylabel('Cell Count', fontsize=22)
-ax1_linear.legend(fontsize=20)
-ax1_linear.tick_params(axis='both', which='major', labelsize=20)
-ax1_linear.grid(True, alpha=0.3)
-
-# 2. DIP感染对比 - Log版本
-ax2_log = axes_log[0, 1]
-ax2_log.plot(df_experimental['time'], df_experimental['dip_counts_log'], 
-         color=colors[2], linewidth=3, 
-         label=labels[0], linestyle=solid_line)
-ax2_log.plot(df_simulation['time'], df_simulation['dip_counts_log'], 
-         color=colors[2], linewidth=3, 
-         label=labels[1], linestyle=dashed_line)
-ax2_log.set_title('DIP-Infected Cells (Log)', fontsize=24, fontweight='bold')
-ax2_log.set_xlabel('Time (hours)', fontsize=22)
-ax2_log.set_ylabel('Log(Cell Count)', fontsize=22)
-ax2_log.legend(fontsize=20)
-ax2_log.tick_params(axis='both', which='major', labelsize=20)
-ax2_log.grid(True, alpha=0.3)
-
-# 2. DIP感染对比 - 线性版本
-ax2_linear = axes_linear[0, 1]
-line1 = ax2_linear.plot(df_experimental['time'], df_experimental['dip_counts'], 
-         color=colors[2], linewidth=3, 
-         label=labels[0], linestyle=solid_line, marker='o', markersize=8)
-line2 = ax2_linear.plot(df_simulation['time'], df_simulation['dip_counts'], 
-         color=colors[2], linewidth=3, 
-         label=labels[1], linestyle=dashed_line, marker='s', markersize=8)
+# 数值标注: 实验值标在点上方, simulation值标在点下方 (共用同一组参数)
+annotate_above = dict(textcoords="offset points", xytext=(0, 10), ha='center', fontsize=14, fontweight='bold')
+annotate_below = dict(textcoords="offset points", xytext=(0, -15), ha='center', fontsize=14, fontweight='bold')
 
-# 添加数值标注
-for i, (x, y1, y2) in enumerate(zip(df_experimental['time'], df_experimental['dip_counts'], df_simulation['dip_counts'])):
-    ax2_linear.annotate(f'{int(y1)}', (x, y1), textcoords="offset points", xytext=(0,10), ha='center', fontsize=14, fontweight='bold')
-    ax2_linear.annotate(f'{int(y2)}', (x, y2), textcoords="offset points", xytext=(0,-15), ha='center', fontsize=14, fontweight='bold')
-
-ax2_linear.set_title('DIP-Infected Cells (Linear)', fontsize=24, fontweight='bold')
-ax2_linear.set_xlabel('Time (hours)', fontsize=22)
-ax2_linear.set_ylabel('Cell Count', fontsize=22)
-ax2_linear.legend(fontsize=20)
-ax2_linear.tick_params(axis='both', which='major', labelsize=20)
-ax2_linear.grid(True, alpha=0.3)
-
-# 3. 双重感染对比 - Log版本
-ax3_log = axes_log[1, 0]
-ax3_log.plot(df_experimental['time'], df_experimental['both_infected_counts_log'], 
-         color=colors[1], linewidth=3, 
-         label=labels[0], linestyle=solid_line)
-ax3_log.plot(df_simulation['time'], df_simulation['both_infected_counts_log'], 
-         color=colors[1], linewidth=3, 
-         label=labels[1], linestyle=dashed_line)
-ax3_log.set_title('Dual-Infected Cells (Log)', fontsize=24, fontweight='bold')
-ax3_log.set_xlabel('Time (hours)', fontsize=22)
-ax3_log.set_ylabel('Log(Cell Count)', fontsize=22)
-ax3_log.legend(fontsize=20)
-ax3_log.tick_params(axis='both', which='major', labelsize=20)
-ax3_log.grid(True, alpha=0.3)
-
-# 3. 双重感染对比 - 线性版本
-ax3_linear = axes_linear[1, 0]
-line1 = ax3_linear.plot(df_experimental['time'], df_experimental['both_infected_counts'], 
-         color=colors[1], linewidth=3, 
-         label=labels[0], linestyle=solid_line, marker='o', markersize=8)
-line2 = ax3_linear.plot(df_simulation['time'], df_simulation['both_infected_counts'], 
-         color=colors[1], linewidth=3, 
-         label=labels[1], linestyle=dashed_line, marker='s', markersize=8)
-
-# 添加数值标注
-for i, (x, y1, y2) in enumerate(zip(df_experimental['time'], df_experimental['both_infected_counts'], df_simulation['both_infected_counts'])):
-    ax3_linear.annotate(f'{int(y1)}', (x, y1), textcoords="offset points", xytext=(0,10), ha='center', fontsize=14, fontweight='bold')
-    ax3_linear.annotate(f'{int(y2)}', (x, y2), textcoords="offset points", xytext=(0,-15), ha='center', fontsize=14, fontweight='bold')
-
-ax3_linear.set_title('Dual-Infected Cells (Linear)', fontsize=24, fontweight='bold')
-ax3_linear.set_xlabel('Time (hours)', fontsize=22)
-ax3_linear.set_ylabel('Cell Count', fontsize=22)
-ax3_linear.legend(fontsize=20)
-ax3_linear.tick_params(axis='both', which='major', labelsize=20)
-ax3_linear.grid(True, alpha=0.3)
-
-# 4. 易感细胞对比 - Log版本
-ax4_log = axes_log[1, 1]
-ax4_log.plot(df_experimental['time'], df_experimental['susceptible_counts_log'], 
-         color=colors[3], linewidth=3, 
-         label=labels[0], linestyle=solid_line)
-ax4_log.plot(df_simulation['time'], df_simulation['susceptible_counts_log'], 
-         color=colors[3], linewidth=3, 
-         label=labels[1], linestyle=dashed_line)
-ax4_log.set_title('Susceptible Cells (Log)', fontsize=24, fontweight='bold')
-ax4_log.set_xlabel('Time (hours)', fontsize=22)
-ax4_log.set_ylabel('Log(Cell Count)', fontsize=22)
-ax4_log.legend(fontsize=20)
-ax4_log.tick_params(axis='both', which='major', labelsize=20)
-ax4_log.grid(True, alpha=0.3)
-
-# 4. 易感细胞对比 - 线性版本
-ax4_linear = axes_linear[1, 1]
-line1 = ax4_linear.plot(df_experimental['time'], df_experimental['susceptible_counts'], 
-         color=colors[3], linewidth=3, 
-         label=labels[0], linestyle=solid_line, marker='o', markersize=8)
-line2 = ax4_linear.plot(df_simulation['time'], df_simulation['susceptible_counts'], 
-         color=colors[3], linewidth=3, 
-         label=labels[1], linestyle=dashed_line, marker='s', markersize=8)
-
-# 添加数值标注
-for i, (x, y1, y2) in enumerate(zip(df_experimental['time'], df_experimental['susceptible_counts'], df_simulation['susceptible_counts'])):
-    ax4_linear.annotate(f'{int(y1)}', (x, y1), textcoords="offset points", xytext=(0,10), ha='center', fontsize=14, fontweight='bold')
-    ax4_linear.annotate(f'{int(y2)}', (x, y2), textcoords="offset points", xytext=(0,-15), ha='center', fontsize=14, fontweight='bold')
-
-ax4_linear.set_title('Susceptible Cells (Linear)', fontsize=24, fontweight='bold')
-ax4_linear.set_xlabel('Time (hours)', fontsize=22)
-ax4_linear.set_ylabel('Cell Count', fontsize=22)
-ax4_linear.legend(fontsize=20)
-ax4_linear.tick_params(axis='both', which='major', labelsize=20)
-ax4_linear.grid(True, alpha=0.3)
+def annotate_pairs(ax, x, y_exp, y_sim):
+    for xi, a, b in zip(x, y_exp, y_sim):
+        ax.annotate(str(int(a)), (xi, a), **annotate_above)
+        ax.annotate(str(int(b)), (xi, b), **annotate_below)
 
 # 设置x轴刻度
 x_ticks = [7, 13, 19, 25]
-for ax in axes_log.flat:
-    ax.set_xticks(x_ticks)
-    ax.set_xticklabels([str(x) for x in x_ticks])
-for ax in axes_linear.flat:
+
+# 画一个子图: 实线=实验数据, 虚线=simulation; 线性版本带数据点标记和数值标注
+def plot_panel(ax, x, y_exp, y_sim, title, ylabel, color, annotate, yscale):
+    exp_markers = dict(marker='o', markersize=8) if annotate else {}
+    sim_markers = dict(marker='s', markersize=8) if annotate else {}
+    ax.plot(x, y_exp, color=color, linewidth=3,
+            label=labels[0], linestyle=solid_line, rasterized=True, **exp_markers)
+    ax.plot(x, y_sim, color=color, linewidth=3,
+            label=labels[1], linestyle=dashed_line, rasterized=True, **sim_markers)
+    if annotate:
+        annotate_pairs(ax, x, y_exp, y_sim)
+    ax.set_yscale(**yscale)
+    ax.set_title(title, fontsize=24, fontweight='bold')
+    ax.set_xlabel('Time (hours)', fontsize=22)
+    ax.set_ylabel(ylabel, fontsize=22)
+    ax.legend(fontsize=20)
+    ax.tick_params(axis='both', which='major', labelsize=20)
+    ax.grid(True, alpha=0.3)
     ax.set_xticks(x_ticks)
     ax.set_xticklabels([str(x) for x in x_ticks])
 
-# 调整布局
-fig_log.tight_layout()
-fig_linear.tight_layout()
-
-# 保存图片到指定的输出文件夹
-output_log_png = os.path.join(simulation_folder, 'comparison_plot_log.png')
-output_log_pdf = os.path.join(simulation_folder, 'comparison_plot_log.pdf')
-output_linear_png = os.path.join(simulation_folder, 'comparison_plot_linear.png')
-output_linear_pdf = os.path.join(simulation_folder, 'comparison_plot_linear.pdf')
-
-fig_log.savefig(output_log_png, dpi=300, bbox_inches='tight')
-fig_log.savefig(output_log_pdf, bbox_inches='tight')
-fig_linear.savefig(output_linear_png, dpi=300, bbox_inches='tight')
-fig_linear.savefig(output_linear_pdf, bbox_inches='tight')
-
-# 打印数值对比
+# 四个子图: (位置, 标题, count_columns中的列号, 颜色)
+# 1. Virion感染对比  2. DIP感染对比  3. 双重感染对比  4. 易感细胞对比
+panels = [
+    ((0, 0), 'Virion-Infected Cells', 0, colors[0]),
+    ((0, 1), 'DIP-Infected Cells', 1, colors[2]),
+    ((1, 0), 'Dual-Infected Cells', 2, colors[1]),
+    ((1, 1), 'Susceptible Cells', 3, colors[3]),
+]
+
+# 两个版本: (标题用的名称, 文件名后缀, y轴标签, 是否标注数值, y轴刻度)
+# Log版本用symlog (0附近线性, linthresh=1), 细胞数为0的点也能画出来
+versions = [
+    ('Log', 'log', 'Cell Count (log scale)', False, dict(value='symlog', linthresh=1)),
+    ('Linear', 'linear', 'Cell Count', True, dict(value='linear')),
+]
+
+# 创建对比图: Log版本和非Log版本共用同一个Figure, 画完一个版本保存后清空再画下一个
+# (constrained layout在绘制时自动排版, 不需要每次再调用tight_layout)
+fig, axes = plt.subplots(2, 2, figsize=(15, 12), layout='constrained')
+for scale, suffix, ylabel, annotate, yscale in versions:
+    fig.suptitle(f'Experimental Data vs Simulation Results - {scale} Scale Comparison', fontsize=16, fontweight='bold')
+    for (row, col), title, j, color in panels:
+        ax = axes[row, col]
+        ax.clear()
+        plot_panel(ax, df_experimental['time'], exp_counts[:, j], sim_counts[:, j],
+                   f'{title} ({scale})', ylabel, color, annotate, yscale)
+
+    # 保存图片到指定的输出文件夹 (曲线已栅格化, PDF中按150dpi嵌入, 坐标轴和文字仍为矢量)
+    # PNG用最快的deflate压缩级别 (文件略大, 编码快很多)
+    fig.savefig(os.path.join(simulation_folder, f'comparison_plot_{suffix}.png'), dpi=300, bbox_inches='tight',
+                pil_kwargs={'compress_level': 1, 'optimize': False})
+    fig.savefig(os.path.join(simulation_folder, f'comparison_plot_{suffix}.pdf'), dpi=150, bbox_inches='tight')
+
+# 打印数值对比 (自然对数, 0按1处理)
+exp_log = np.log(np.maximum(exp_counts, 1))
+sim_log = np.log(np.maximum(sim_counts, 1))
 print("=== Numerical Comparison (Log Scale) ===")
 print("\nVirion-Infected Cells (Log):")
 for i, t in enumerate(df_experimental['time']):
-    print(f"Time {t}h: Experimental={df_experimental['virion_counts_log'].iloc[i]:.2f}, Simulation={df_simulation['virion_counts_log'].iloc[i]:.2f}")
+    print(f"Time {t}h: Experimental={exp_log[i, 0]:.2f}, Simulation={sim_log[i, 0]:.2f}")
 
 print("\nDIP-Infected Cells (Log):")
 for i, t in enumerate(df_experimental['time']):
-    print(f"Time {t}h: Experimental={df_experimental['dip_counts_log'].iloc[i]:.2f}, Simulation={df_simulation['dip_counts_log'].iloc[i]:.2f}")
+    print(f"Time {t}h: Experimental={exp_log[i, 1]:.2f}, Simulation={sim_log[i, 1]:.2f}")
 
 print("\nDual-Infected Cells (Log):")
 for i, t in enumerate(df_experimental['time']):
-    print(f"Time {t}h: Experimental={df_experimental['both_infected_counts_log'].iloc[i]:.2f}, Simulation={df_simulation['both_infected_counts_log'].iloc[i]:.2f}")
+    print(f"Time {t}h: Experimental={exp_log[i, 2]:.2f}, Simulation={sim_log[i, 2]:.2f}")
 
 print("\nSusceptible Cells (Log):")
 for i, t in enumerate(df_experimental['time']):
-    print(f"Time {t}h: Experimental={df_experimental['susceptible_counts_log'].iloc[i]:.2f}, Simulation={df_simulation['susceptible_counts_log'].iloc[i]:.2f}")
+    print(f"Time {t}h: Experimental={exp_log[i, 3]:.2f}, Simulation={sim_log[i, 3]:.2f}")
 
 print("\n✅ Comparison plot saved as 'comparison_plot_log.png' and 'comparison_plot_log.pdf'") 
\ No newline at end of file
@@ -1,5 +1,8 @@
 
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Figures are only saved to file, no GUI backend needed
 import matplotlib.pyplot as plt
 import os
 import sys
@@ -7,7 +10,10 @@ import matplotlib.lines as mlines
 
 # Load the CSV file
 file_path = './simulation_output.csv'
-df = pd.read_csv(file_path)
+# Only parse the columns used below (pyarrow's multithreaded parser)
+columns = ['Time', 'Plaque Percentage', 'max_global_IFN', 'v_pfu_initial', 'd_pfu_initial',
+           'RHO', 'BURST_SIZE', 'DIP_BURST_PCT']
+df = pd.read_csv(file_path, usecols=columns, engine='pyarrow')
 
 # Extract values for the title
 max_global_IFN = df['max_global_IFN'].iloc[0]
@@ -31,8 +37,12 @@ experiment_vero_50 = [0,0, 0.704717105910202, 1.795833997483578, 3.5070185136826
 time_points_for_markers = [0, 24, 48, 72, 96, 120, 144]
 
 # Filter plaque percentage values at specific time points
-df_filtered = df[df['Time'].isin(time_points_for_markers)]
-plaque_percentage_values_at_markers = df_filtered['Plaque Percentage'].values
+# (Time is monotonically increasing, so binary search finds the rows directly)
+times = df['Time'].to_numpy()
+marker_idx = np.searchsorted(times, time_points_for_markers)
+if np.any(marker_idx >= len(times)) or not np.array_equal(times[marker_idx], time_points_for_markers):
+    raise ValueError(f"{file_path} does not contain all marker time points {time_points_for_markers}")
+plaque_percentage_values_at_markers = df['Plaque Percentage'].to_numpy()[marker_idx]
 
 # Plot the line for Simulation Plaque Percentage (including red triangle markers)
 ax.plot(time_points_for_markers, plaque_percentage_values_at_markers, color='red', linewidth=5, alpha=0.6)
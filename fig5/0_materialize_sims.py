@@ -0,0 +1,95 @@
+"""
+Collects the Time / global IFN series of every simulation run into one zstd-compressed
+parquet file (all_sims.parquet), keyed by replicate, run folder and DIP burst size.
+
+Scripts 4, 6 and 7 read this file when it exists instead of re-parsing the CSV tree.
+Re-run it after adding or re-running simulations, or delete the file to go back to the CSVs.
+"""
+import os
+import sys
+import importlib
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+
+# Replicate discovery is shared with script 4 so both see the same set of runs
+peak_script = importlib.import_module('4_process_peak_ifn')
+
+MATERIALIZED_PATH = 'all_sims.parquet'
+IFN_COL = 'Global IFN Concentration Per Cell'
+CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(include_columns=['Time', IFN_COL])
+
+def load_run(sim_dir):
+    """Reads one run as (burst_size_DIP, seed, time, ifn), or None if it has no usable data."""
+    bst_match = peak_script.DIPBST_RE.search(os.path.basename(sim_dir))
+    if not bst_match:
+        return None
+
+    seed = -1
+    seed_file = os.path.join(sim_dir, 'seed.txt')
+    try:
+        with open(seed_file, 'r') as f:
+            seed = int(f.read().strip())
+    except (IOError, ValueError):
+        print(f"Warning: Could not read seed from {seed_file}", file=sys.stderr)
+
+    data_file = os.path.join(sim_dir, 'simulation_output.csv')
+    if not os.path.exists(data_file):
+        print(f"Warning: Data file not found: {data_file}", file=sys.stderr)
+        return None
+    try:
+        table = pacsv.read_csv(data_file, convert_options=CSV_CONVERT_OPTIONS)
+    except Exception as e:
+        print(f"Error processing {data_file}: {e}", file=sys.stderr)
+        return None
+    if table.num_rows == 0:
+        print(f"Warning: Data file is empty: {data_file}", file=sys.stderr)
+        return None
+    return int(bst_match.group(1)), seed, table.column('Time').to_numpy(), table.column(IFN_COL).to_numpy()
+
+def main():
+    base_dir = 'IFNclr3_30runs_global_celltocell_tau95_option1'
+    replicate_dirs = peak_script.find_replicate_dirs(base_dir, '.')
+    if not replicate_dirs:
+        print("Error: No replicate directories found in known locations.", file=sys.stderr)
+        sys.exit(1)
+    print(f"Found {len(replicate_dirs)} replicate directories to materialize.")
+
+    sim_dirs, sim_replicates = [], []
+    for rep_dir in replicate_dirs:
+        replicate_id = peak_script.extract_replicate_id(rep_dir)
+        if replicate_id is None:
+            print(f"Warning: Could not determine replicate ID for {rep_dir}", file=sys.stderr)
+            continue
+        rep_sim_dirs = peak_script.find_simulation_dirs(rep_dir)
+        sim_dirs.extend(rep_sim_dirs)
+        sim_replicates.extend([(replicate_id, os.path.normpath(rep_dir))] * len(rep_sim_dirs))
+
+    columns = {name: [] for name in ['replicate_id', 'replicate_dir', 'sim_dir', 'burst_size_DIP', 'seed', 'Time', IFN_COL]}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for sim_dir, (replicate_id, rep_dir), run in zip(sim_dirs, sim_replicates, executor.map(load_run, sim_dirs, chunksize=16)):
+            if run is None:
+                continue
+            burst_size, seed, time, ifn = run
+            n = len(time)
+            columns['replicate_id'].append(np.full(n, replicate_id, dtype=np.int32))
+            columns['replicate_dir'].append(np.full(n, rep_dir, dtype=object))
+            columns['sim_dir'].append(np.full(n, os.path.normpath(sim_dir), dtype=object))
+            columns['burst_size_DIP'].append(np.full(n, burst_size, dtype=np.int32))
+            columns['seed'].append(np.full(n, seed, dtype=np.int64))
+            columns['Time'].append(time)
+            columns[IFN_COL].append(ifn)
+
+    if not columns['Time']:
+        print("Error: No simulation runs could be read.", file=sys.stderr)
+        sys.exit(1)
+
+    table = pa.table({name: np.concatenate(parts) for name, parts in columns.items()})
+    # Folder names repeat on every row of a run; dictionary encoding stores each once
+    pq.write_table(table, MATERIALIZED_PATH, compression='zstd', use_dictionary=['replicate_dir', 'sim_dir'])
+    print(f"Wrote {table.num_rows} rows from {len(columns['Time'])} runs to {MATERIALIZED_PATH}")
+
+if __name__ == '__main__':
+    main()
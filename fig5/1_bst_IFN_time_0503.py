@@ -1,10 +1,20 @@
 import os
+import sys
 import pandas as pd
+import matplotlib
+headless = '--headless' in sys.argv[1:]  # ✅ 批量运行时加 --headless, 只保存不弹窗
+if headless:
+    matplotlib.use('Agg')  # 无界面运行时不加载 GUI 后端
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
+import matplotlib.lines as mlines
+from matplotlib.collections import LineCollection
 import re
 import numpy as np
+import pyarrow.csv as pacsv
+import pyarrow.compute as pc
+from concurrent.futures import ThreadPoolExecutor
 
 # === 设置 ===
 folder_name = "IFNclr5_loop_burstSizeD_global_celltocell_tau95_option1"  # ⚠️ 只改这里
@@ -38,62 +48,100 @@ elif 'burstSizeD' in folder_name:
 else:
     raise ValueError("Cannot determine loop type from folder name.")
 
-# 找到所有子文件夹
-subfolders = [f for f in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, f)) and re.match(r'^\d+_', f)]
+# 找到所有子文件夹, 提取 burst 值并排序
+# (os.scandir 直接给出是否为目录, 不用每个再 stat; 正则只编译一次)
+run_folder_re = re.compile(r'^\d+_')
+burst_re = re.compile(pattern)
+selected_set = set(selected_bursts)
 
-# 提取 burst 值并排序
 burst_folders = []
-for folder in subfolders:
-    match = re.search(pattern, folder)
-    if match:
-        burst_value = int(match.group(1))
-        if select_all or burst_value in selected_bursts:
-            burst_folders.append((burst_value, folder))
+with os.scandir(base_dir) as entries:
+    for entry in entries:
+        if not (run_folder_re.match(entry.name) and entry.is_dir()):
+            continue
+        match = burst_re.search(entry.name)
+        if match:
+            burst_value = int(match.group(1))
+            if select_all or burst_value in selected_set:
+                burst_folders.append((burst_value, entry.name))
 
 burst_folders.sort()
 
+# 只解析用到的列 (pyarrow多线程解析器)
+ifn_columns = ['Time', 'Global IFN Concentration Per Cell']
+
 # 记录 IFN 数据
 ifn_results = []
-max_ifn_lookup = {}
-for burst_value, folder in burst_folders:
-    file_path = os.path.join(base_dir, folder, 'simulation_output.csv')
-    if os.path.exists(file_path):
-        df = pd.read_csv(file_path)
-        max_ifn_lookup[burst_value] = df['Global IFN Concentration Per Cell'].max()
+
+# 并行读取每个 burst 的 CSV (线程池, pyarrow 解析时释放 GIL), 只读一次供后面复用
+# 直接用 pyarrow 读成 Table (不建 DataFrame), max 用 pyarrow.compute 在列上算
+# 缓存 numpy 数组 (time, ifn) 和 max, 画图时直接用
+ifn_convert_options = pacsv.ConvertOptions(include_columns=ifn_columns)
+
+def load_burst(burst_folder):
+    file_path = os.path.join(base_dir, burst_folder[1], 'simulation_output.csv')
+    if not os.path.exists(file_path):
+        return None
+    table = pacsv.read_csv(file_path, convert_options=ifn_convert_options)
+    ifn_column = table.column('Global IFN Concentration Per Cell')
+    return table.column('Time').to_numpy(), ifn_column.to_numpy(), pc.max(ifn_column).as_py()
+
+with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+    loaded = dict(zip(burst_folders, executor.map(load_burst, burst_folders)))
+
+max_ifn_lookup = {
+    burst_value: arrays[2]
+    for (burst_value, folder), arrays in loaded.items() if arrays is not None
+}
 
 max_ifn_burst_value = max(max_ifn_lookup, key=max_ifn_lookup.get)
 
 # 创建左右图布局
 # 创建左右图布局
-from matplotlib.gridspec import GridSpec
-
-fig = plt.figure(figsize=(14, 6))
-gs = GridSpec(1, 2, width_ratios=[1.2, 1], wspace=0.4)  # ✅ 增加 wspace 空隙
+# constrained layout 在绘制时排版 (包括图外的 legend), 不再需要 tight_layout
+fig = plt.figure(figsize=(14, 6), layout='constrained')
+fig.get_layout_engine().set(wspace=0.08, rect=(0, 0, 0.9, 1))  # ✅ 增加 wspace 空隙, 右侧留白
+gs = fig.add_gridspec(1, 2, width_ratios=[1.2, 1])
 main_ax = fig.add_subplot(gs[0])
 bar_ax = fig.add_subplot(gs[1])
 
 # 左图：IFN dynamics 曲线
-for burst_value, folder in burst_folders:
+# 普通曲线收集到一个 LineCollection 里一次画完, 最大 IFN 的红线单独画在最上层
+# 颜色一次性查表: (N, 4) RGBA 数组, 最大 IFN 的那条设为红色
+burst_values_np = np.array([burst_value for burst_value, _ in burst_folders])
+color_lut = cmap(norm(burst_values_np))
+color_lut[burst_values_np == max_ifn_burst_value] = mcolors.to_rgba('red')
+
+segments, segment_colors, segment_widths = [], [], []
+legend_handles = []
+for i, (burst_value, folder) in enumerate(burst_folders):
     file_path = os.path.join(base_dir, folder, 'simulation_output.csv')
-    if os.path.exists(file_path):
-        df = pd.read_csv(file_path)
-        time = df['Time']
-        ifn_concentration = df['Global IFN Concentration Per Cell']
+    arrays = loaded[(burst_value, folder)]
+    if arrays is not None:
+        time, ifn_concentration, _ = arrays
         is_max = (burst_value == max_ifn_burst_value)
-        color = 'red' if is_max else cmap(norm(burst_value))
+        color = color_lut[i]
         linewidth = 3.5 if is_max else (2.5 if is_max else 1.5)
         z = 15 if is_max else (10 if is_max else 1)
         alpha = 1.0
 
-        main_ax.plot(time, ifn_concentration, label=f'{burst_label} {burst_value}',
-                     color=color, linewidth=linewidth, zorder=z, alpha=alpha)
+        label = f'{burst_label} {burst_value}'
+        if is_max:
+            line, = main_ax.plot(time, ifn_concentration, label=label,
+                                 color=color, linewidth=linewidth, zorder=z, alpha=alpha, rasterized=True)
+            legend_handles.append(line)
+        else:
+            segments.append(np.column_stack([time, ifn_concentration]))
+            segment_colors.append(color)
+            segment_widths.append(linewidth)
+            legend_handles.append(mlines.Line2D([], [], color=color, linewidth=linewidth, label=label))
 
         # ✅ 动态高亮最大 IFN 的线
         # if is_max:
         #     mid_index = len(time) // 2
         #     main_ax.text(
-        #         time.iloc[mid_index],
-        #         ifn_concentration.iloc[mid_index],
+        #         time[mid_index],
+        #         ifn_concentration[mid_index],
         #         f'{burst_value} ← Max IFN',
         #         fontsize=9,
         #         va='center',
@@ -107,18 +155,23 @@ for burst_value, folder in burst_folders:
 
         ifn_results.append({
             'BurstSize': burst_value,
-            'End_IFN_Concentration': ifn_concentration.iloc[-1],
+            'End_IFN_Concentration': ifn_concentration[-1],
             'Max_IFN_Concentration': max_ifn_lookup[burst_value]
         })
     else:
         print(f'⚠️ Warning: {file_path} not found.')
 
+main_ax.add_collection(LineCollection(segments, colors=segment_colors, linewidths=segment_widths,
+                                      zorder=1, rasterized=True))
+main_ax.autoscale_view()
+
 main_ax.set_xlabel('Time')
 main_ax.set_ylabel('Global IFN Concentration Per Cell')
 main_ax.set_title(f'IFN Dynamics (Time ≤ 500) Across {burst_label}s\n(τ={tau_val}, option={option_val})')
 
 # ✅ 修改 legend 样式：小字体，多列，图外显示
 main_ax.legend(
+    handles=legend_handles,
     fontsize=6,
     loc='upper left',
     bbox_to_anchor=(1.02, 1),
@@ -133,11 +186,15 @@ results_df = pd.DataFrame(ifn_results)
 df_bar = results_df.copy()
 max_ifn = df_bar['Max_IFN_Concentration'].max()
 
-for x, y in zip(df_bar['BurstSize'], df_bar['Max_IFN_Concentration']):
-    color = 'red' if y == max_ifn else 'black'
-    bar_ax.vlines(x=x, ymin=0, ymax=y, color=color, linewidth=1.5)
-    bar_ax.plot(x, y, 'o', color=color)
-    # bar_ax.text(x, y + 0.05, f'{y:.2f}', ha='center', va='bottom', fontsize=9, color=color)
+# 一次画完所有竖线, 再分黑/红两组画圆点 (最大值标红)
+bar_x = df_bar['BurstSize'].to_numpy()
+bar_y = df_bar['Max_IFN_Concentration'].to_numpy()
+is_max_bar = bar_y == max_ifn
+bar_ax.vlines(x=bar_x, ymin=0, ymax=bar_y, colors=np.where(is_max_bar, 'red', 'black'), linewidth=1.5, rasterized=True)
+bar_ax.plot(bar_x[~is_max_bar], bar_y[~is_max_bar], 'o', color='black', rasterized=True)
+bar_ax.plot(bar_x[is_max_bar], bar_y[is_max_bar], 'o', color='red', rasterized=True)
+# for x, y in zip(bar_x, bar_y):
+#     bar_ax.text(x, y + 0.05, f'{y:.2f}', ha='center', va='bottom', fontsize=9, color='red' if y == max_ifn else 'black')
 
 bar_ax.set_xticks(sorted(df_bar['BurstSize']))
 bar_ax.tick_params(axis='x', labelrotation=45, labelsize=7)  # ✅ 旋转字体 + 缩小字号
@@ -148,18 +205,21 @@ bar_ax.set_xticks(sorted(df_bar['BurstSize']))
 bar_ax.grid(True, alpha=0.3)
 
 # 保存合图
-fig.tight_layout(rect=[0, 0, 0.9, 1])  # ← 更新这一行
 combined_path = os.path.join(base_dir, f"1_maxIFN_vs_{burst_label}_{folder_name}.png")
-plt.savefig(combined_path, dpi=400)
+plt.savefig(combined_path, dpi=400, pil_kwargs={'compress_level': 1, 'optimize': False})  # 最快的 PNG 压缩级别
 print(f"✅ Saved combined figure to: {combined_path}")
-plt.show()
+if not headless:
+    plt.show()
 
 # 保存 CSV
 results_df = results_df[['BurstSize', 'End_IFN_Concentration', 'Max_IFN_Concentration']]
-results_df['Order'] = results_df['Max_IFN_Concentration'].rank(method='min', ascending=False).astype(int)
-row_max = results_df.loc[results_df['Max_IFN_Concentration'].idxmax()].copy()
+# 名次 = 比它大的个数 + 1 (并列取最小名次, 同 rank(method='min', ascending=False))
+max_ifn_values = results_df['Max_IFN_Concentration'].to_numpy()
+order = np.searchsorted(np.sort(-max_ifn_values), -max_ifn_values, side='left') + 1
+results_df['Order'] = order.astype(object)  # object 列, 末尾那行要写入文字
+row_max = results_df.iloc[int(max_ifn_values.argmax())].copy()
 row_max['Order'] = "Max IFN BurstSize"
-results_df = pd.concat([results_df, pd.DataFrame([row_max])], ignore_index=True)
+results_df.loc[len(results_df)] = row_max
 
 csv_path = os.path.join(base_dir, f"maxIFN_burst_{folder_name}.csv")
 results_df.to_csv(csv_path, index=False)
@@ -1,37 +1,53 @@
 import os
 import re
+import numpy as np
 import pandas as pd
-import glob
 import sys
-
-def find_replicate_dirs(root_path):
-    """Finds all replicate directories."""
-    pattern = os.path.join(root_path, 'IFNclr3_30runs_global_celltocell_tau95_option1*')
-    all_paths = glob.glob(pattern)
-    rep_dirs = [p for p in all_paths if os.path.isdir(p)]
-    
-    if not rep_dirs:
-        print(f"Error: No replicate directories found matching pattern: {pattern}", file=sys.stderr)
-        sys.exit(1)
-        
-    return rep_dirs
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+
+REPLICATE_PREFIX = 'IFNclr3_30runs_global_celltocell_tau95_option1'
+IFN_COL = 'Global IFN Concentration Per Cell'
+# Written by 0_materialize_sims.py; used instead of the CSV tree when present
+MATERIALIZED_PATH = 'all_sims.parquet'
+# Simulation folder names, e.g. '12_DIPBst300_...' (same set as glob '[0-9]*_DIPBst*')
+SIM_DIR_RE = re.compile(r'^\d.*_DIPBst')
+DIPBST_RE = re.compile(r'DIPBst(\d+)')
+REPLICATE_ID_RE = re.compile(r'_(\d+)$')
+
+def find_replicate_dirs(*root_paths):
+    """Finds all replicate directories directly under any of root_paths, in one scandir pass per root."""
+    rep_dirs = set()
+    for root_path in root_paths:
+        if not os.path.isdir(root_path):
+            continue
+        # scandir gives the entry type from the directory listing, so no stat per path
+        with os.scandir(root_path) as entries:
+            rep_dirs.update(entry.path for entry in entries
+                            if entry.name.startswith(REPLICATE_PREFIX) and entry.is_dir())
+    return sorted(rep_dirs)
 
 def extract_replicate_id(dir_name):
     """Extracts replicate ID from a directory name."""
-    match = re.search(r'_(\d+)$', dir_name)
+    match = REPLICATE_ID_RE.search(dir_name)
     if match:
         return int(match.group(1))
     # Check if it's the first replicate which might not have a suffix
-    if 'option1' in os.path.basename(dir_name) and not re.search(r'_\d+$', dir_name):
+    if 'option1' in os.path.basename(dir_name) and not REPLICATE_ID_RE.search(dir_name):
         return 1
     return None
 
+def find_simulation_dirs(rep_dir):
+    """Finds the simulation directories of one replicate."""
+    with os.scandir(rep_dir) as entries:
+        return [entry.path for entry in entries if SIM_DIR_RE.match(entry.name) and entry.is_dir()]
+
 def process_simulation_dir(sim_dir):
     """Processes a single simulation directory to extract peak IFN data."""
     base_name = os.path.basename(sim_dir)
     
     # Extract burst size
-    bst_match = re.search(r'DIPBst(\d+)', base_name)
+    bst_match = DIPBST_RE.search(base_name)
     if not bst_match:
         return None
     burst_size_DIP = int(bst_match.group(1))
@@ -51,23 +67,26 @@ def process_simulation_dir(sim_dir):
         print(f"Warning: Data file not found: {data_file}", file=sys.stderr)
         return None
         
+    # The CSV contains a time series of global IFN
+    time_col = 'Time'
+    ifn_col = IFN_COL
+
     try:
-        df = pd.read_csv(data_file)
+        # Only the two needed columns, parsed by pyarrow's multithreaded reader
+        df = pd.read_csv(data_file, engine='pyarrow', usecols=[time_col, ifn_col])
         if df.empty:
             print(f"Warning: Data file is empty: {data_file}", file=sys.stderr)
             return None
-        
-        # The CSV contains a time series of global IFN
-        time_col = 'Time'
-        ifn_col = 'Global IFN Concentration Per Cell'
 
         if time_col not in df.columns or ifn_col not in df.columns:
             print(f"Warning: '{time_col}' or '{ifn_col}' column not found in {data_file}", file=sys.stderr)
             return None
 
-        peak_idx = df[ifn_col].idxmax()
-        peak_IFN = df.loc[peak_idx, ifn_col]
-        t_peak_IFN = df.loc[peak_idx, time_col]
+        # Positional argmax on the raw column arrays (NaN-skipping, like idxmax)
+        ifn_values = df[ifn_col].to_numpy()
+        peak_idx = np.nanargmax(ifn_values)
+        peak_IFN = ifn_values[peak_idx]
+        t_peak_IFN = df[time_col].to_numpy()[peak_idx]
         
         return {
             'burst_size_DIP': burst_size_DIP,
@@ -80,8 +99,8 @@ def process_simulation_dir(sim_dir):
         print(f"Error processing {data_file}: {e}", file=sys.stderr)
         return None
 
-def main():
-    """Main function to orchestrate the processing."""
+def collect_peaks_from_csvs():
+    """Discovers every replicate's simulation directories and extracts their peak IFN from the CSVs."""
     results = []
     
     # Look for replicate directories inside the main experiment folder and also as siblings
@@ -89,12 +108,8 @@ def main():
     
     # Case 1: Replicate folders are inside the base folder
     # e.g., IFNclr3_30runs_global_celltocell_tau95_option1/IFNclr3_30runs_global_celltocell_tau95_option1_2/
-    nested_replicate_dirs = find_replicate_dirs(base_dir)
-
     # Case 2: Replicate folders are siblings to the base folder (as seen in some logs)
-    sibling_replicate_dirs = find_replicate_dirs('.')
-    
-    replicate_dirs = sorted(list(set(nested_replicate_dirs + sibling_replicate_dirs)))
+    replicate_dirs = find_replicate_dirs(base_dir, '.')
 
     if not replicate_dirs:
         print("Error: No replicate directories found in known locations.", file=sys.stderr)
@@ -102,20 +117,51 @@ def main():
 
     print(f"Found {len(replicate_dirs)} replicate directories to process.")
 
+    sim_dirs, sim_replicate_ids = [], []
     for rep_dir in replicate_dirs:
         replicate_id = extract_replicate_id(rep_dir)
         if replicate_id is None:
             print(f"Warning: Could not determine replicate ID for {rep_dir}", file=sys.stderr)
             continue
             
-        sim_dirs = glob.glob(os.path.join(rep_dir, '[0-9]*_DIPBst*'))
-        
-        for sim_dir in sim_dirs:
-            data = process_simulation_dir(sim_dir)
+        rep_sim_dirs = find_simulation_dirs(rep_dir)
+        sim_dirs.extend(rep_sim_dirs)
+        sim_replicate_ids.extend([replicate_id] * len(rep_sim_dirs))
+
+    # Simulation directories are independent, so parse them across worker processes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for replicate_id, data in zip(sim_replicate_ids, executor.map(process_simulation_dir, sim_dirs, chunksize=16)):
             if data:
                 data['replicate_id'] = replicate_id
                 results.append(data)
 
+    return results
+
+def collect_peaks_from_materialized(path):
+    """Extracts the peak IFN of every run from the parquet written by 0_materialize_sims.py."""
+    df = pq.read_table(path, columns=['replicate_id', 'sim_dir', 'burst_size_DIP', 'seed', 'Time', IFN_COL]).to_pandas()
+    # One row per run: the row holding its (NaN-skipping) IFN maximum. Missing samples are dropped
+    # first, so a run with no IFN values is skipped (as the CSV path does) instead of failing idxmax
+    df = df.dropna(subset=[IFN_COL])
+    peak_rows = df.loc[df.groupby('sim_dir', sort=False, observed=True)[IFN_COL].idxmax()]
+    peaks = pd.DataFrame({
+        'burst_size_DIP': peak_rows['burst_size_DIP'].to_numpy(),
+        'seed': peak_rows['seed'].to_numpy(),
+        'peak_IFN': peak_rows[IFN_COL].to_numpy(),
+        't_peak_IFN': peak_rows['Time'].to_numpy(),
+        'scenario': 'baseline',
+        'replicate_id': peak_rows['replicate_id'].to_numpy(),
+    })
+    return peaks.to_dict('records')
+
+def main():
+    """Main function to orchestrate the processing."""
+    if os.path.exists(MATERIALIZED_PATH):
+        print(f"Reading materialized runs from {MATERIALIZED_PATH}")
+        results = collect_peaks_from_materialized(MATERIALIZED_PATH)
+    else:
+        results = collect_peaks_from_csvs()
+
     if not results:
         print("Error: No simulation results could be processed.", file=sys.stderr)
         sys.exit(1)
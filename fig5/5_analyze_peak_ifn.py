@@ -4,7 +4,11 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pygam import LinearGAM, s, intercept
 from statsmodels.nonparametric.smoothers_lowess import lowess
+from scipy.linalg import cho_factor, cho_solve
+from scipy.interpolate import BSpline
+from scipy.stats import t as t_dist
 from tqdm import tqdm
+from numba import njit
 
 # --- Configuration ---
 sns.set_theme(style="whitegrid")
@@ -12,27 +16,98 @@ plt.rcParams['figure.figsize'] = (10, 6)
 BOOTSTRAP_SAMPLES = 1000
 PERMUTATION_SAMPLES = 10000
 CI_LEVEL = 0.95
+# Penalized B-spline smooth (pygam's s(0, basis='ps') defaults)
+N_SPLINES = 20
+SPLINE_ORDER = 3
+LAM = 0.6
+
+@njit(cache=True)
+def _snr_sorted(values, group_starts):
+    """SNR over values already sorted by group; group g spans values[group_starts[g]:group_starts[g + 1]]."""
+    n_groups = len(group_starts) - 1
+    means = np.empty(n_groups)
+    var_sum = 0.0
+    n_var = 0
+    for g in range(n_groups):
+        group = values[group_starts[g]:group_starts[g + 1]]
+        means[g] = group.mean()
+        # Single-member groups have no within-group variance (NaN in pandas, skipped by .mean())
+        if len(group) > 1:
+            var_sum += ((group - means[g]) ** 2).sum() / (len(group) - 1)
+            n_var += 1
+
+    # Variance of the means between groups (signal); NaN for fewer than two groups, like pandas' .var()
+    if n_groups > 1:
+        var_between = ((means - means.mean()) ** 2).sum() / (n_groups - 1)
+    else:
+        var_between = np.nan
+
+    # Mean of the variances within groups (noise); NaN when no group has two members, as in pandas
+    if n_var == 0:
+        return np.nan
+    mean_var_within = var_sum / n_var
 
-def calculate_snr(df, group_col, value_col):
-    """Calculates the signal-to-noise ratio."""
-    grouped = df.groupby(group_col)[value_col]
-    
-    # Variance of the means between groups (signal)
-    var_between = grouped.mean().var(ddof=1)
-    
-    # Mean of the variances within groups (noise)
-    mean_var_within = grouped.var(ddof=1).mean()
-    
     if mean_var_within == 0:
         return np.inf
-        
+
     return var_between / mean_var_within
 
-def find_optimum(model, X_data):
-    """Finds the input value that maximizes the model's prediction."""
-    grid = np.linspace(X_data.min(), X_data.max(), 500)
-    preds = model.predict(grid)
-    return grid[np.argmax(preds)]
+@njit(cache=True)
+def _snr_sorted_rows(rows, group_starts):
+    """_snr_sorted for each row of a 2D array (one permutation per row)."""
+    snr = np.empty(rows.shape[0])
+    for i in range(rows.shape[0]):
+        snr[i] = _snr_sorted(rows[i], group_starts)
+    return snr
+
+def group_layout(keys):
+    """Returns the stable sort order of keys and the start offset of each group in that order."""
+    order = np.argsort(keys, kind='stable')
+    _, counts = np.unique(keys, return_counts=True)
+    group_starts = np.concatenate(([0], np.cumsum(counts)))
+    return order, group_starts
+
+def calculate_snr(df, group_col, value_col):
+    """Calculates the signal-to-noise ratio."""
+    order, group_starts = group_layout(df[group_col].to_numpy())
+    values = df[value_col].to_numpy(dtype=np.float64)
+    return _snr_sorted(values[order], group_starts)
+
+def ps_design_matrix(x, x_min, x_max):
+    """B-spline design matrix of pygam's s(0, basis='ps') term on [x_min, x_max], plus the intercept column.
+
+    N_SPLINES cubic B-splines on uniform knots spanning the data range (the same basis pygam builds),
+    so refits on permuted or resampled rows of X reuse rows of this matrix.
+    """
+    inner = np.linspace(x_min, x_max, N_SPLINES - SPLINE_ORDER + 1)
+    step = inner[1] - inner[0]
+    pad = step * np.arange(1, SPLINE_ORDER + 1)
+    knots = np.concatenate([x_min - pad[::-1], inner, x_max + pad])
+    basis = BSpline.design_matrix(np.ravel(x), knots, SPLINE_ORDER).toarray()
+    return np.column_stack([basis, np.ones(len(basis))])
+
+def ps_penalty():
+    """Second-difference penalty LAM * DᵀD on the spline coefficients (the intercept is unpenalized)."""
+    D = np.diff(np.eye(N_SPLINES), n=2, axis=0)
+    P = np.zeros((N_SPLINES + 1, N_SPLINES + 1))
+    P[:N_SPLINES, :N_SPLINES] = LAM * D.T @ D
+    # pygam adds sqrt(eps) to the diagonal to improve conditioning
+    return P + np.sqrt(np.finfo(np.float64).eps) * np.eye(N_SPLINES + 1)
+
+def find_optimum(X_grid, B_grid, coefs):
+    """Finds the grid value that maximizes the spline prediction B_grid @ coefs.
+
+    coefs may hold one coefficient vector or one per column; each column gets its own optimum.
+    """
+    return X_grid[np.argmax(B_grid @ coefs, axis=0)]
+
+def confidence_band(gam, B_grid, width=0.95):
+    """Pointwise confidence band of a fitted LinearGAM on the grid basis (as gam.confidence_intervals)."""
+    fit = B_grid @ gam.coef_
+    # Diagonal of B_grid · cov · B_gridᵀ without forming the full matrix
+    se = np.sqrt(np.einsum('ij,jk,ik->i', B_grid, gam.statistics_['cov'], B_grid))
+    q = t_dist.ppf((1 + width) / 2, df=gam.statistics_['n_samples'] - gam.statistics_['edof'])
+    return fit - q * se, fit + q * se
 
 def main():
     """Main analysis function."""
@@ -53,7 +128,7 @@ def main():
     # 2. Fit Generalized Additive Model (GAM)
     print("Fitting Generalized Additive Model (GAM)...")
     # Using Penalized B-splines (ps) which are similar to thin-plate splines
-    gam = LinearGAM(s(0, basis='ps', lam=0.6)).fit(X, y)
+    gam = LinearGAM(s(0, basis='ps', n_splines=N_SPLINES, spline_order=SPLINE_ORDER, lam=LAM)).fit(X, y)
     gam.summary()
 
     # Manually calculate Pseudo R^2
@@ -74,48 +149,64 @@ def main():
     # 3. Calculate Signal-to-Noise Ratio (SNR)
     snr_observed = calculate_snr(df, 'burst_size_ratio', 'peak_IFN')
     
+    # Basis and penalty for the bootstrap/permutation refits, built once: each refit
+    # solves (BᵀB + P) β = Bᵀy on rows of B instead of a full pygam fit
+    B = ps_design_matrix(X, X.min(), X.max())
+    P = ps_penalty()
+    X_grid = np.linspace(X.min(), X.max(), 500)
+    B_grid = ps_design_matrix(X_grid, X.min(), X.max())
+
     # 4. Find Optimal Burst Size Ratio
-    b_star_observed = find_optimum(gam, X)
+    # (gam's coefficients are in the same basis: N_SPLINES splines, then the intercept)
+    b_star_observed = find_optimum(X_grid, B_grid, gam.coef_)
     
     # 5. Bootstrap Confidence Interval for Optimal Burst Size Ratio
     print(f"\nRunning {BOOTSTRAP_SAMPLES} bootstrap samples to find CI for optimal burst size ratio...")
-    b_star_bootstrapped = []
+    beta_bootstrapped = np.empty((B.shape[1], BOOTSTRAP_SAMPLES))
     
-    for _ in tqdm(range(BOOTSTRAP_SAMPLES)):
+    # Row indices of each burst size ratio, computed once for the stratified resampling
+    groups = [np.flatnonzero(X.ravel() == v) for v in np.unique(X)]
+    rng = np.random.default_rng()
+    for i in tqdm(range(BOOTSTRAP_SAMPLES)):
         # Resample with replacement, stratified by burst size ratio
-        bootstrap_sample = df.groupby('burst_size_ratio').sample(frac=1, replace=True)
-        X_boot = bootstrap_sample[['burst_size_ratio']].values
-        y_boot = bootstrap_sample['peak_IFN'].values
+        boot_idx = np.concatenate([rng.choice(g, size=len(g), replace=True) for g in groups])
         
-        gam_boot = LinearGAM(s(0, basis='ps')).fit(X_boot, y_boot)
-        b_star_boot = find_optimum(gam_boot, X_boot)
-        b_star_bootstrapped.append(b_star_boot)
+        # Every group is resampled, so X_boot spans the same range and grid as X
+        B_boot = B[boot_idx]
+        beta_bootstrapped[:, i] = cho_solve(cho_factor(B_boot.T @ B_boot + P), B_boot.T @ y[boot_idx])
+
+    # Every bootstrap optimum from one (grid × draws) GEMM
+    b_star_bootstrapped = find_optimum(X_grid, B_grid, beta_bootstrapped)
 
     lower_ci = np.percentile(b_star_bootstrapped, (1 - CI_LEVEL) / 2 * 100)
     upper_ci = np.percentile(b_star_bootstrapped, (1 + CI_LEVEL) / 2 * 100)
 
     # 6. Permutation Test for Global Significance
     print(f"\nRunning {PERMUTATION_SAMPLES} permutations for null distribution...")
-    perm_r2 = []
-    perm_snr = []
     
-    df_perm = df.copy()
-    for _ in tqdm(range(PERMUTATION_SAMPLES)):
-        df_perm['burst_size_ratio'] = np.random.permutation(df_perm['burst_size_ratio'])
-        X_perm = df_perm[['burst_size_ratio']].values
-        
-        # Fit GAM and calculate R^2
-        gam_perm = LinearGAM(s(0, basis='ps')).fit(X_perm, y)
-        
-        # Manually calculate R^2 for permuted data
-        perm_deviance = gam_perm.statistics_['deviance']
-        perm_r2.append(1 - (perm_deviance / null_deviance))
-        
-        # Calculate SNR
-        perm_snr.append(calculate_snr(df_perm, 'burst_size_ratio', 'peak_IFN'))
+    # Permuting the labels is the same as permuting y against the original labels, so each
+    # row of Y_perm holds one permutation of y and the group layout / basis B stay fixed
+    n = len(y)
+    Y_perm = rng.permuted(np.broadcast_to(y, (PERMUTATION_SAMPLES, n)), axis=1)
+
+    # Fit all permuted GAMs at once: BᵀB + P is shared, so one factorization and one GEMM
+    cho = cho_factor(B.T @ B + P)
+    beta_perm = cho_solve(cho, B.T @ Y_perm.T)
+    rss = ((Y_perm - (B @ beta_perm).T) ** 2).sum(axis=1)
+
+    # R^2 = 1 - RSS / TSS of each permuted fit against the observed fit's.
+    # (pygam's deviance is scaled by the estimated scale RSS / (n - edof), so it is always n - edof
+    # and the deviance-based R^2 is the same for every permutation: it can't serve as the test statistic)
+    tss = ((y - y.mean()) ** 2).sum()
+    r2_observed = 1 - ((y - B @ gam.coef_) ** 2).sum() / tss
+    perm_r2 = 1 - rss / tss
+
+    # Calculate SNR for every permutation in one call
+    order, group_starts = group_layout(X.ravel())
+    perm_snr = _snr_sorted_rows(Y_perm[:, order], group_starts)
 
-    p_value_r2_perm = np.mean(np.array(perm_r2) >= adj_r_squared)
-    p_value_snr_perm = np.mean(np.array(perm_snr) >= snr_observed)
+    p_value_r2_perm = np.mean(perm_r2 >= r2_observed)
+    p_value_snr_perm = np.mean(perm_snr >= snr_observed)
 
     # 7. Model-free check with LOESS
     # Using a default span, as LOOCV is computationally expensive for a quick script.
@@ -128,10 +219,10 @@ def main():
     # Scatter plot of raw data
     sns.scatterplot(x='burst_size_ratio', y='peak_IFN', data=df, ax=ax, alpha=0.3, label='Stochastic Replicates')
 
-    # GAM fit and confidence bands
-    grid = gam.generate_X_grid(term=0, n=500)
-    ax.plot(grid, gam.predict(grid), color='red', linewidth=2, label='GAM Fit')
-    ax.fill_between(grid[:, 0], gam.confidence_intervals(grid)[:, 0], gam.confidence_intervals(grid)[:, 1], color='red', alpha=0.2, label='95% Confidence Band')
+    # GAM fit and confidence bands (on the cached grid basis, same grid as generate_X_grid)
+    ci_lower, ci_upper = confidence_band(gam, B_grid)
+    ax.plot(X_grid, B_grid @ gam.coef_, color='red', linewidth=2, label='GAM Fit')
+    ax.fill_between(X_grid, ci_lower, ci_upper, color='red', alpha=0.2, label='95% Confidence Band')
 
     # LOESS fit
     ax.plot(loess_fit[:, 0], loess_fit[:, 1], color='green', linestyle='--', linewidth=2, label='LOESS Fit')
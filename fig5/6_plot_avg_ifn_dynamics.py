@@ -1,62 +1,27 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import glob
-import os
-import re
-from tqdm import tqdm
+from _ifn_runs import (find_all_simulation_dirs, group_simulations_by_burst_size, load_materialized_runs,
+                       iter_burst_runs, average_by_time)
 
-def find_all_simulation_dirs(root_dir='.'):
-    """Find all simulation directories across all replicate folders."""
-    # Correcting the path based on the user-provided directory structure
-    base_path = os.path.join(root_dir, 'IFNclr3_30runs_global_celltocell_tau95_option1', 'IFNclr3_30runs_global_celltocell_tau95_option1')
-    
-    if not os.path.isdir(base_path):
-        print(f"Error: The target directory does not exist: {base_path}")
-        return []
-
-    sim_pattern = os.path.join(base_path, '[0-9]*_DIPBst*')
-    all_sim_dirs = glob.glob(sim_pattern)
-    return all_sim_dirs
-
-def group_simulations_by_burst_size(sim_dirs, target_burst_sizes):
-    """Groups simulation file paths by their DIP burst size."""
-    grouped_files = {size: [] for size in target_burst_sizes}
-    
-    for sim_dir in sim_dirs:
-        base_name = os.path.basename(sim_dir)
-        bst_match = re.search(r'DIPBst(\d+)', base_name)
-        if bst_match:
-            burst_size = int(bst_match.group(1))
-            if burst_size in grouped_files:
-                csv_path = os.path.join(sim_dir, 'simulation_output.csv')
-                if os.path.exists(csv_path):
-                    grouped_files[burst_size].append(csv_path)
-    
-    return grouped_files
-
-def process_data(grouped_files):
+def process_data(grouped_files, series=None):
     """Calculate average dynamics and average max IFN for each burst size."""
     avg_dynamics = {}
     avg_max_ifn = {}
 
-    for burst_size, paths in tqdm(grouped_files.items(), desc="Processing burst sizes"):
-        if not paths:
+    for burst_size, runs in iter_burst_runs(grouped_files, series):
+        if not runs:
             continue
 
         # Process for dynamics (left plot)
-        all_dfs = [pd.read_csv(p) for p in paths]
-        combined_df = pd.concat(all_dfs)
-        
         # Ensure time points are consistent for averaging
         # This assumes a common time grid or we can interpolate if needed
         # For simplicity, we group by time and average.
-        time_series_avg = combined_df.groupby('Time')['Global IFN Concentration Per Cell'].mean()
+        time_series_avg = average_by_time(runs)
         avg_dynamics[burst_size] = time_series_avg
 
         # Process for max IFN (right plot)
-        max_ifns = [df['Global IFN Concentration Per Cell'].max() for df in all_dfs]
+        max_ifns = [np.nanmax(ifn) for _, ifn in runs]
         avg_max_ifn[burst_size] = np.mean(max_ifns)
         
     return avg_dynamics, avg_max_ifn
@@ -105,18 +70,23 @@ def plot_results(avg_dynamics, avg_max_ifn):
 def main():
     target_burst_sizes = list(range(100, 1601, 100))
     
-    print("Finding all simulation directories...")
-    all_sim_dirs = find_all_simulation_dirs()
-    
-    if not all_sim_dirs:
-        print("Error: No simulation directories found.")
-        return
+    materialized = load_materialized_runs(target_burst_sizes)
+    if materialized is not None:
+        grouped_files, series = materialized
+    else:
+        print("Finding all simulation directories...")
+        all_sim_dirs = find_all_simulation_dirs()
         
-    print(f"Found {len(all_sim_dirs)} total simulation runs.")
-    
-    grouped_files = group_simulations_by_burst_size(all_sim_dirs, target_burst_sizes)
+        if not all_sim_dirs:
+            print("Error: No simulation directories found.")
+            return
+            
+        print(f"Found {len(all_sim_dirs)} total simulation runs.")
+        
+        grouped_files = group_simulations_by_burst_size(all_sim_dirs, target_burst_sizes)
+        series = None
     
-    avg_dynamics, avg_max_ifn = process_data(grouped_files)
+    avg_dynamics, avg_max_ifn = process_data(grouped_files, series)
     
     if not avg_dynamics:
         print("Error: No data processed. Check if CSV files and correct burst sizes are present.")
@@ -2,10 +2,8 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import glob
-import os
-import re
-from tqdm import tqdm
+from _ifn_runs import (find_all_simulation_dirs, group_simulations_by_burst_size, load_materialized_runs,
+                       load_ifn_series, iter_burst_runs, average_by_time)
 from pygam import LinearGAM, s, intercept
 from statsmodels.nonparametric.smoothers_lowess import lowess
 
@@ -17,49 +15,39 @@ TICK_FONTSIZE = 36
 LEGEND_TITLE_FONTSIZE = 30
 LEGEND_FONTSIZE = 27
 
-# --- Data Processing Functions (from script 6) ---
-def find_all_simulation_dirs(root_dir='.'):
-    """Find all simulation directories based on the known structure."""
-    base_path = os.path.join(root_dir, 'IFNclr3_30runs_global_celltocell_tau95_option1', 'IFNclr3_30runs_global_celltocell_tau95_option1')
-    if not os.path.isdir(base_path): return []
-    return glob.glob(os.path.join(base_path, '[0-9]*_DIPBst*'))
+# --- Data Processing Functions (run loading is shared with script 6 in _ifn_runs.py) ---
+def with_peak(time, ifn):
+    """Returns (time, ifn, peak_ifn) for one run, or None if it has no data."""
+    if len(ifn):
+        return time, ifn, ifn[np.nanargmax(ifn)]
+    return None
 
-def group_simulations_by_burst_size(sim_dirs, target_burst_sizes):
-    grouped_files = {size: [] for size in target_burst_sizes}
-    for sim_dir in sim_dirs:
-        bst_match = re.search(r'DIPBst(\d+)', os.path.basename(sim_dir))
-        if bst_match and int(bst_match.group(1)) in grouped_files:
-            csv_path = os.path.join(sim_dir, 'simulation_output.csv')
-            if os.path.exists(csv_path):
-                grouped_files[int(bst_match.group(1))].append(csv_path)
-    return grouped_files
+def load_ifn_run(csv_path):
+    """Reads one run once and returns (time, ifn, peak_ifn), or None if it has no data (runs in a worker process)."""
+    try:
+        return with_peak(*load_ifn_series(csv_path))
+    except Exception as e:
+        print(f"Warning: Could not process {csv_path}: {e}")
+    return None
 
-def process_avg_data(grouped_files):
+def process_combined(grouped_files, series=None):
+    """Single pass over every run: average dynamics and max IFN (left panel) plus per-run peak IFN (right panel)."""
     avg_dynamics, avg_max_ifn = {}, {}
-    for burst_size, paths in tqdm(grouped_files.items(), desc="Averaging Dynamics"):
-        if not paths: continue
-        all_dfs = [pd.read_csv(p) for p in paths]
-        combined_df = pd.concat(all_dfs)
-        avg_dynamics[burst_size] = combined_df.groupby('Time')['Global IFN Concentration Per Cell'].mean()
-        avg_max_ifn[burst_size] = np.mean([df['Global IFN Concentration Per Cell'].max() for df in all_dfs])
-    return avg_dynamics, avg_max_ifn
-
-def process_peak_data(grouped_files):
-    """Processes individual runs to get peak IFN data for the right panel."""
-    peak_data = []
-    for burst_size, paths in tqdm(grouped_files.items(), desc="Extracting Peak IFN"):
-        if not paths: continue
-        for csv_path in paths:
-            try:
-                df = pd.read_csv(csv_path)
-                if not df.empty:
-                    peak_idx = df['Global IFN Concentration Per Cell'].idxmax()
-                    peak_ifn = df.loc[peak_idx, 'Global IFN Concentration Per Cell']
-                    peak_data.append({'burst_size_DIP': burst_size, 'peak_IFN': peak_ifn})
-            except Exception as e:
-                print(f"Warning: Could not process {csv_path}: {e}")
-    return pd.DataFrame(peak_data)
-
+    # One slot per run, filled in order; unreadable runs leave the tail unused
+    n_runs = sum(len(paths) for paths in grouped_files.values())
+    peak_bursts = np.empty(n_runs, dtype=np.int32)
+    peak_ifns = np.empty(n_runs, dtype=np.float64)
+    k = 0
+    for burst_size, burst_runs in iter_burst_runs(grouped_files, series, load_run=load_ifn_run, from_series=with_peak):
+        if not burst_runs: continue
+        avg_dynamics[burst_size] = average_by_time([(time, ifn) for time, ifn, _ in burst_runs])
+        burst_peaks = [peak_ifn for _, _, peak_ifn in burst_runs]
+        avg_max_ifn[burst_size] = np.mean(burst_peaks)
+        peak_bursts[k:k + len(burst_peaks)] = burst_size
+        peak_ifns[k:k + len(burst_peaks)] = burst_peaks
+        k += len(burst_peaks)
+    df_peak = pd.DataFrame({'burst_size_DIP': peak_bursts[:k], 'peak_IFN': peak_ifns[:k]})
+    return avg_dynamics, avg_max_ifn, df_peak
 
 # --- Analysis Functions (from script 5) ---
 def find_optimum(model, X_data):
@@ -70,13 +58,17 @@ def find_optimum(model, X_data):
 def main():
     # --- Part 1: IFN Dynamics Plot (Left) ---
     target_burst_sizes = list(range(100, 1601, 100))
-    all_sim_dirs = find_all_simulation_dirs()
-    grouped_files = group_simulations_by_burst_size(all_sim_dirs, target_burst_sizes)
-    avg_dynamics, avg_max_ifn = process_avg_data(grouped_files)
+    materialized = load_materialized_runs(target_burst_sizes)
+    if materialized is not None:
+        grouped_files, series = materialized
+    else:
+        all_sim_dirs = find_all_simulation_dirs()
+        grouped_files = group_simulations_by_burst_size(all_sim_dirs, target_burst_sizes)
+        series = None
+    # Each run is read once; the peak data for the right panel comes from the same pass
+    avg_dynamics, avg_max_ifn, df_peak = process_combined(grouped_files, series)
 
     # --- Part 2: Peak IFN Analysis Plot (Right) ---
-    # Generate peak data on the fly from the same filtered set of runs
-    df_peak = process_peak_data(grouped_files)
     if df_peak.empty:
         print("Error: No peak IFN data could be generated for the right panel.")
         return
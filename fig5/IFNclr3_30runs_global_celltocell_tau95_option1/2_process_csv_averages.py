@@ -6,10 +6,9 @@ and calculate averages for each group of 30 folders to generate 14 summary CSV f
 
 import os
 import pandas as pd
-import re
 import numpy as np
 from collections import defaultdict
-import glob
+from _common_avg import DIPBST_RE, _add_present, average_column
 
 def extract_dipbst_from_folder_name(folder_name):
     """
@@ -17,30 +16,27 @@ def extract_dipbst_from_folder_name(folder_name):
     Example: "1_Dinit0_DIPBst100_noJ_Vinit1_VBst50_Global_mdbk_times502_tau95_ifnBothFold1.00_grid50_VStimulateIFNtrue"
     should return 100
     """
-    match = re.search(r'DIPBst(\d+)', folder_name)
+    match = DIPBST_RE.search(folder_name)
     if match:
         return int(match.group(1))
     return None
 
-def get_all_folders():
+def group_folders_by_dipbst():
     """
-    Get all folders in the current directory that match the pattern.
-    """
-    folders = []
-    for item in os.listdir('.'):
-        if os.path.isdir(item) and 'DIPBst' in item:
-            folders.append(item)
-    return sorted(folders)
-
-def group_folders_by_dipbst(folders):
-    """
-    Group folders by their DIPBst values.
+    Scan the current directory once and group the run folders by their DIPBst values.
     """
     groups = defaultdict(list)
-    for folder in folders:
-        dipbst = extract_dipbst_from_folder_name(folder)
-        if dipbst is not None:
-            groups[dipbst].append(folder)
+    # scandir gives the entry type from the directory listing, so no os.path.isdir stat per entry
+    with os.scandir('.') as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            dipbst = extract_dipbst_from_folder_name(entry.name)
+            if dipbst is not None:
+                groups[dipbst].append(entry.name)
+    # Same folder order within a group as before (sorted names)
+    for group_folders in groups.values():
+        group_folders.sort()
     return groups
 
 def process_csv_file(csv_path):
@@ -48,7 +44,8 @@ def process_csv_file(csv_path):
     Read and process a single CSV file.
     """
     try:
-        df = pd.read_csv(csv_path)
+        # pyarrow's multithreaded parser; every column is averaged, so all are read
+        df = pd.read_csv(csv_path, engine='pyarrow')
         return df
     except Exception as e:
         print(f"Error reading {csv_path}: {e}")
@@ -78,34 +75,43 @@ def calculate_averages_for_group(folders, group_name):
     print(f"Successfully loaded {len(all_dataframes)} CSV files for group {group_name}")
     
     # Calculate averages across all dataframes
-    # For each column, calculate the mean across all dataframes
-    averaged_data = {}
-    
     # Get the first dataframe to get column names
     first_df = all_dataframes[0]
     
+    # Columns that are numeric in every file are averaged in one go, as (n_rows, n_cols) blocks
+    numeric_columns = [column for column in first_df.select_dtypes('number').columns if column != 'Time']
+    if all(len(df) == len(first_df) for df in all_dataframes):
+        for df in all_dataframes[1:]:
+            df_numeric = set(df.select_dtypes('number').columns)
+            numeric_columns = [column for column in numeric_columns if column in df_numeric]
+    else:
+        numeric_columns = []
+    
+    column_means = {}
+    if numeric_columns:
+        # Running NaN-skipping sum and count, one file at a time, instead of a
+        # (n_files, n_rows, n_cols) stack (same additions in the same order as nanmean over it);
+        # each later file is added in one compiled pass, without NaN masks or temporaries
+        values = all_dataframes[0][numeric_columns].to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        sums = np.where(present, values, 0.0)
+        counts = present.astype(np.intp)
+        for df in all_dataframes[1:]:
+            _add_present(sums, counts, df[numeric_columns].to_numpy(dtype=np.float64))
+        with np.errstate(invalid='ignore'):
+            means = sums / counts  # NaN where a value is missing in every file
+        column_means = {column: means[:, j] for j, column in enumerate(numeric_columns)}
+    
+    averaged_data = {}
     for column in first_df.columns:
         if column == 'Time':
             # Keep time column as is (should be the same across all files)
             averaged_data[column] = first_df[column]
+        elif column in column_means:
+            averaged_data[column] = column_means[column]
         else:
-            # Only average numeric columns, keep non-numeric as the first value
-            try:
-                # Try converting all values to float
-                column_values = []
-                for df in all_dataframes:
-                    if column in df.columns:
-                        column_values.append(pd.to_numeric(df[column], errors='coerce').values)
-                # If at least one value is numeric, do the mean
-                if any([np.issubdtype(np.array(vals).dtype, np.number) for vals in column_values]):
-                    stacked_values = np.column_stack(column_values)
-                    averaged_data[column] = np.nanmean(stacked_values, axis=1)
-                else:
-                    # Non-numeric column, just use the first file's value
-                    averaged_data[column] = first_df[column]
-            except Exception as e:
-                # If any error, fallback to first file's value
-                averaged_data[column] = first_df[column]
+            # Mixed / non-numeric columns keep the per-column handling
+            averaged_data[column] = average_column(all_dataframes, column)
     
     # Create the averaged dataframe
     averaged_df = pd.DataFrame(averaged_data)
@@ -118,12 +124,10 @@ def main():
     """
     print("Starting CSV processing...")
     
-    # Get all folders
-    folders = get_all_folders()
-    print(f"Found {len(folders)} folders")
+    # Get all folders, grouped by DIPBst values
+    groups = group_folders_by_dipbst()
+    print(f"Found {sum(len(group_folders) for group_folders in groups.values())} folders")
     
-    # Group folders by DIPBst values
-    groups = group_folders_by_dipbst(folders)
     print(f"Found {len(groups)} different DIPBst values: {sorted(groups.keys())}")
     
     # Process each group
@@ -138,9 +142,10 @@ def main():
         averaged_df = calculate_averages_for_group(group_folders, f"DIPBst{dipbst_value}")
         
         if averaged_df is not None:
-            # Save the averaged data
+            # Save the averaged data (CSV for reading, parquet for the plotting scripts)
             output_filename = f"summary_DIPBst{dipbst_value}.csv"
             averaged_df.to_csv(output_filename, index=False)
+            averaged_df.to_parquet(f"summary_DIPBst{dipbst_value}.parquet", engine='pyarrow', compression='snappy', index=False)
             print(f"Saved {output_filename}")
         else:
             print(f"Failed to process group DIPBst{dipbst_value}")
@@ -4,18 +4,13 @@ Enhanced script to plot IFN levels over time from summary CSV files.
 Each line represents a different DIPBst value with better visualization.
 """
 
-import pandas as pd
+# Selects the Agg backend unless run with --show on a display, so it comes before pyplot
+from _summary_index import show_figures, load_summary_index, read_summary, RASTERIZE_MIN_POINTS
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from matplotlib.lines import Line2D
 import numpy as np
-import glob
-import re
-
-def extract_dipbst_from_filename(filename):
-    """Extract DIPBst value from filename."""
-    match = re.search(r'DIPBst(\d+)', filename)
-    if match:
-        return int(match.group(1))
-    return None
 
 def plot_ifn_levels_enhanced():
     """Plot IFN levels over time for all summary files with enhanced styling."""
@@ -23,77 +18,66 @@ def plot_ifn_levels_enhanced():
     # Set style for better looking plots
     plt.style.use('default')
     
-    # Get all summary files
-    summary_files = glob.glob('summary_DIPBst*.csv')
-    summary_files.sort()
+    # Get all summary files (parquet copies when present), sorted by DIPBst
+    summary_index = load_summary_index()
     
-    print(f"Found {len(summary_files)} summary files")
+    print(f"Found {len(summary_index)} summary files")
     
     # Create the plot with larger size
     fig, ax = plt.subplots(figsize=(14, 10))
     
     # Store data for analysis
     all_data = []
-    max_ifn_data = []
+    max_ifn_values = []
     
-    # First pass: collect all data to find the maximum IFN line
-    for file in summary_files:
+    # Read every file once: cache its time/IFN array for plotting and the max to pick the red line
+    for dipbst_value, file in summary_index.itertuples(index=False, name=None):
         try:
-            df = pd.read_csv(file)
-            dipbst_value = extract_dipbst_from_filename(file)
-            ifn_level = df['Global IFN Concentration Per Cell']
+            df = read_summary(file, ['Time', 'Global IFN Concentration Per Cell'])
+            # (n, 2) array of (time, IFN) points, used as-is for the line segment
+            curve = df[['Time', 'Global IFN Concentration Per Cell']].to_numpy()
             
-            all_data.append((dipbst_value, ifn_level))
-            max_ifn_data.append((dipbst_value, np.max(ifn_level)))
+            all_data.append((dipbst_value, curve))
+            max_ifn_values.append(np.max(curve[:, 1]))
             
         except Exception as e:
             print(f"Error processing {file}: {e}")
     
-    # Find the DIPBst value with the maximum IFN
-    max_ifn_dipbst = max(max_ifn_data, key=lambda x: x[1])[0]
+    # Find the DIPBst value with the maximum IFN (one argmax over the collected maxima)
+    dipbst_arr = np.fromiter((data[0] for data in all_data), dtype=np.int64, count=len(all_data))
+    max_ifn_arr = np.fromiter(max_ifn_values, dtype=np.float64, count=len(max_ifn_values))
+    max_ifn_dipbst = int(dipbst_arr[max_ifn_arr.argmax()])
     print(f"DIPBst with maximum IFN: {max_ifn_dipbst}")
     
     # Sort by DIPBst value for color gradient
-    all_data.sort(key=lambda x: x[0])
-    
-    # Create blue color gradient (lightest for lowest DIPBst)
-    dipbst_values = [data[0] for data in all_data]
-    min_dipbst = min(dipbst_values)
-    max_dipbst = max(dipbst_values)
-    
-    # Plot each summary file
-    for i, (dipbst_value, ifn_level) in enumerate(all_data):
-        try:
-            # Read the CSV file to get time
-            file = f"summary_DIPBst{dipbst_value}.csv"
-            df = pd.read_csv(file)
-            time = df['Time']
-            
-            # Determine color: red for max IFN, blue gradient for others
-            if dipbst_value == max_ifn_dipbst:
-                color = 'red'
-                linewidth = 3.0
-                alpha = 1.0
-                label = f'DIPBst = {dipbst_value} (Max IFN)'
-            else:
-                # Blue gradient: lightest for lowest DIPBst
-                normalized_value = (dipbst_value - min_dipbst) / (max_dipbst - min_dipbst)
-                color = plt.cm.Blues(0.3 + 0.6 * normalized_value)  # Start from 0.3 to avoid too light
-                linewidth = 2.0
-                alpha = 0.7
-                label = f'DIPBst = {dipbst_value}'
-            
-            # Plot the line
-            line, = ax.plot(time, ifn_level, 
-                           label=label, 
-                           color=color, 
-                           linewidth=linewidth,
-                           alpha=alpha)
-            
-            print(f"Plotted DIPBst = {dipbst_value} (color: {'red' if dipbst_value == max_ifn_dipbst else 'blue'})")
-                
-        except Exception as e:
-            print(f"Error processing DIPBst {dipbst_value}: {e}")
+    order = dipbst_arr.argsort(kind='stable')
+    all_data = [all_data[i] for i in order]
+    
+    # Create blue color gradient (lightest for lowest DIPBst): one colormap lookup
+    # for all curves, then red (opaque, thicker) for the max IFN curve
+    sorted_dipbst = dipbst_arr[order]
+    min_dipbst, max_dipbst = sorted_dipbst[0], sorted_dipbst[-1]
+    normalized_values = (sorted_dipbst - min_dipbst) / ((max_dipbst - min_dipbst) or 1)
+    line_colors = plt.cm.Blues(0.3 + 0.6 * normalized_values)  # Start from 0.3 to avoid too light
+    line_colors[:, 3] = 0.7
+    is_max = sorted_dipbst == max_ifn_dipbst
+    line_colors[is_max] = to_rgba('red', 1.0)
+    line_widths = np.where(is_max, 3.0, 2.0)
+    
+    # Collect all curves into one LineCollection (drawn in DIPBst order, as before);
+    # the legend gets one proxy handle per curve
+    lines = []
+    legend_handles = []
+    for i, (dipbst_value, curve) in enumerate(all_data):
+        label = f'DIPBst = {dipbst_value} (Max IFN)' if is_max[i] else f'DIPBst = {dipbst_value}'
+        lines.append(curve)
+        legend_handles.append(Line2D([], [], color=line_colors[i], linewidth=line_widths[i], label=label))
+        
+        print(f"Plotted DIPBst = {dipbst_value} (color: {'red' if is_max[i] else 'blue'})")
+    
+    ax.add_collection(LineCollection(lines, colors=line_colors, linewidths=line_widths, zorder=2,
+                                   rasterized=sum(map(len, lines)) > RASTERIZE_MIN_POINTS))
+    ax.autoscale_view()
     
     # Customize the plot
     ax.set_xlabel('Time', fontsize=16, fontweight='bold')
@@ -105,7 +89,8 @@ def plot_ifn_levels_enhanced():
     ax.grid(True, alpha=0.3, linestyle='--')
     
     # Create legend with better positioning
-    legend = ax.legend(loc='center left', 
+    legend = ax.legend(handles=legend_handles,
+                      loc='center left', 
                       bbox_to_anchor=(1.02, 0.5),
                       fontsize=11,
                       frameon=True,
@@ -113,25 +98,26 @@ def plot_ifn_levels_enhanced():
                       shadow=True)
     
     # Adjust layout to prevent label cutoff
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save the plot with high resolution
-    plt.savefig('ifn_levels_comparison_enhanced.png', 
+    fig.savefig('ifn_levels_comparison_enhanced.png', 
                 dpi=300, 
                 bbox_inches='tight',
                 facecolor='white',
                 edgecolor='none')
     print("Enhanced plot saved as 'ifn_levels_comparison_enhanced.png'")
     
-    # Also save as PDF for vector graphics
-    plt.savefig('ifn_levels_comparison_enhanced.pdf', 
+    # Also save as PDF for vector graphics (dense curves rasterized at 300 dpi)
+    fig.savefig('ifn_levels_comparison_enhanced.pdf', 
+                dpi=300,
                 bbox_inches='tight',
                 facecolor='white',
                 edgecolor='none')
     print("Enhanced plot also saved as 'ifn_levels_comparison_enhanced.pdf'")
     
-    # Show the plot
-    plt.show()
+    if show_figures:
+        plt.show()
 
 if __name__ == "__main__":
     plot_ifn_levels_enhanced() 
\ No newline at end of file
@@ -4,18 +4,11 @@ Script to create a scatter plot of IFN maximum values vs DIPBst values.
 Each point represents a DIPBst value with its corresponding maximum IFN level.
 """
 
-import pandas as pd
+# Selects the Agg backend unless run with --show on a display, so it comes before pyplot
+from _summary_index import show_figures, load_summary_index, read_summary
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import numpy as np
-import glob
-import re
-
-def extract_dipbst_from_filename(filename):
-    """Extract DIPBst value from filename."""
-    match = re.search(r'DIPBst(\d+)', filename)
-    if match:
-        return int(match.group(1))
-    return None
 
 def plot_ifn_max_scatter():
     """Create scatter plot of IFN maximum values vs DIPBst values."""
@@ -23,11 +16,10 @@ def plot_ifn_max_scatter():
     # Set style for better looking plots
     plt.style.use('default')
     
-    # Get all summary files
-    summary_files = glob.glob('summary_DIPBst*.csv')
-    summary_files.sort()
+    # Get all summary files (parquet copies when present), sorted by DIPBst
+    summary_index = load_summary_index()
     
-    print(f"Found {len(summary_files)} summary files")
+    print(f"Found {len(summary_index)} summary files")
     
     # Create the plot
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -37,10 +29,9 @@ def plot_ifn_max_scatter():
     max_ifn_values = []
     
     # Collect data from all files
-    for file in summary_files:
+    for dipbst_value, file in summary_index.itertuples(index=False, name=None):
         try:
-            df = pd.read_csv(file)
-            dipbst_value = extract_dipbst_from_filename(file)
+            df = read_summary(file, ['Global IFN Concentration Per Cell'])
             ifn_level = df['Global IFN Concentration Per Cell']
             max_ifn = np.max(ifn_level)
             
@@ -53,42 +44,28 @@ def plot_ifn_max_scatter():
             print(f"Error processing {file}: {e}")
     
     # Sort by DIPBst value for proper ordering
-    sorted_data = sorted(zip(dipbst_values, max_ifn_values))
-    dipbst_values = [x[0] for x in sorted_data]
-    max_ifn_values = [x[1] for x in sorted_data]
+    dipbst_arr = np.fromiter(dipbst_values, dtype=np.int64, count=len(dipbst_values))
+    max_arr = np.fromiter(max_ifn_values, dtype=np.float64, count=len(max_ifn_values))
+    order = dipbst_arr.argsort(kind='stable')
+    dipbst_arr, max_arr = dipbst_arr[order], max_arr[order]
     
     # Find the maximum IFN value
-    max_ifn_overall = max(max_ifn_values)
-    max_ifn_index = max_ifn_values.index(max_ifn_overall)
-    max_ifn_dipbst = dipbst_values[max_ifn_index]
+    max_ifn_index = int(max_arr.argmax())
+    max_ifn_overall = max_arr[max_ifn_index]
+    max_ifn_dipbst = dipbst_arr[max_ifn_index]
     
     print(f"\nMaximum IFN value: {max_ifn_overall:.6f} at DIPBst = {max_ifn_dipbst}")
     
-    # Plot each point with vertical line
-    for i, (dipbst, max_ifn) in enumerate(zip(dipbst_values, max_ifn_values)):
-        if max_ifn == max_ifn_overall:
-            # Red for maximum IFN
-            color = 'red'
-            marker_size = 100
-            linewidth = 3
-            alpha = 1.0
-            label = f'DIPBst = {dipbst} (Max IFN)'
-        else:
-            # Black for others
-            color = 'black'
-            marker_size = 60
-            linewidth = 1.5
-            alpha = 0.7
-            label = None
-        
-        # Plot vertical line from 0 to max IFN
-        ax.plot([dipbst, dipbst], [0, max_ifn], 
-                color=color, linewidth=linewidth, alpha=alpha)
-        
-        # Plot point at max IFN
-        ax.scatter(dipbst, max_ifn, 
-                  color=color, s=marker_size, alpha=alpha, 
-                  zorder=5, label=label)
+    # All stems are drawn by one vlines call and all points by one scatter call;
+    # the maximum is drawn red, the others black
+    is_max = max_arr == max_ifn_overall
+    colors = np.where(is_max[:, None], [1, 0, 0, 1.0], [0, 0, 0, 0.7])
+    
+    # Vertical lines from 0 to max IFN
+    ax.vlines(dipbst_arr, 0, max_arr, colors=colors, linewidths=np.where(is_max, 3, 1.5), zorder=2)
+    
+    # Points at max IFN
+    ax.scatter(dipbst_arr, max_arr, c=colors, s=np.where(is_max, 100, 60), zorder=5)
     
     # Customize the plot
     ax.set_xlabel('DIPBst Value', fontsize=16, fontweight='bold')
@@ -100,32 +77,34 @@ def plot_ifn_max_scatter():
     ax.grid(True, alpha=0.3, linestyle='--')
     
     # Set x-axis to show all DIPBst values
-    ax.set_xticks(dipbst_values)
-    ax.set_xticklabels(dipbst_values, rotation=45)
+    ax.set_xticks(dipbst_arr)
+    ax.set_xticklabels(dipbst_arr, rotation=45)
     
-    # Create legend for the maximum point
-    handles, labels = ax.get_legend_handles_labels()
+    # Create legend for the maximum point(s)
+    handles = [Line2D([], [], color='red', marker='o', markersize=10, linestyle='none',
+                      label=f'DIPBst = {dipbst} (Max IFN)')
+               for dipbst in dipbst_arr[is_max]]
     if handles:
-        legend = ax.legend(loc='upper left', fontsize=12,
+        legend = ax.legend(handles=handles, loc='upper left', fontsize=12,
                           frameon=True, fancybox=True, shadow=True)
     
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save the plot
-    plt.savefig('ifn_max_vs_dipbst_scatter.png', 
+    fig.savefig('ifn_max_vs_dipbst_scatter.png', 
                 dpi=300, bbox_inches='tight',
                 facecolor='white', edgecolor='none')
     print("\nScatter plot saved as 'ifn_max_vs_dipbst_scatter.png'")
     
     # Also save as PDF
-    plt.savefig('ifn_max_vs_dipbst_scatter.pdf', 
+    fig.savefig('ifn_max_vs_dipbst_scatter.pdf', 
                 bbox_inches='tight',
                 facecolor='white', edgecolor='none')
     print("Scatter plot also saved as 'ifn_max_vs_dipbst_scatter.pdf'")
     
-    # Show the plot
-    plt.show()
+    if show_figures:
+        plt.show()
 
 if __name__ == "__main__":
     plot_ifn_max_scatter() 
\ No newline at end of file
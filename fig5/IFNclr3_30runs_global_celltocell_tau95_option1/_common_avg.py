@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Averaging of each selected DIPBst group of 30 simulation runs, shared by process_selected_burstSizeD.py
+and process_summary_from_IFNclr3_30runs_global_celltocell_tau95_option1_2.py
+(2_process_csv_averages.py uses its averaging kernels).
+"""
+
+import os
+import re
+import hashlib
+from collections import defaultdict
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from numba import njit
+
+DIPBST_RE = re.compile(r'DIPBst(\d+)')
+# Part of every cache key: bump it when the averaging changes, so averages cached by older code are not reused
+CACHE_VERSION = 1
+
+def extract_dipbst_from_folder_name(folder_name):
+    match = DIPBST_RE.search(folder_name)
+    if match:
+        return int(match.group(1))
+    return None
+
+def get_all_folders(input_dir):
+    """
+    Run folders (names containing DIPBst) directly under input_dir, sorted by name.
+    """
+    # scandir gives the entry type from the directory listing, so no os.path.isdir stat per entry
+    with os.scandir(input_dir) as entries:
+        return sorted(entry.name for entry in entries if 'DIPBst' in entry.name and entry.is_dir())
+
+def group_folders_by_dipbst(folders, selected_list):
+    groups = defaultdict(list)
+    for folder in folders:
+        dipbst = extract_dipbst_from_folder_name(folder)
+        if dipbst is not None and dipbst in selected_list:
+            groups[dipbst].append(folder)
+    return groups
+
+def read_run_csv(csv_path, column_types=None):
+    """
+    Read one run's simulation_output.csv; returns None if it cannot be read.
+    """
+    try:
+        # pyarrow's multithreaded parser; every column is averaged, so all are read.
+        # Given column_types, Arrow parses straight into them instead of inferring types,
+        # reading the memory-mapped file directly instead of copying it through read() buffers
+        if column_types is not None:
+            try:
+                with pa.memory_map(csv_path) as source:
+                    return pacsv.read_csv(source, convert_options=pacsv.ConvertOptions(column_types=column_types)).to_pandas()
+            except pa.ArrowInvalid:
+                pass  # values that don't fit those types: read with inference below
+        return pd.read_csv(csv_path, engine='pyarrow')
+    except Exception as e:
+        print(f"Error reading {csv_path}: {e}")
+        return None
+
+def arrow_column_types(df):
+    """
+    Arrow type of each column of df, to read the other runs without type inference.
+    """
+    return {field.name: field.type for field in pa.Schema.from_pandas(df, preserve_index=False)}
+
+@njit(cache=True)
+def _add_present(sums, counts, values):
+    """Adds values into the running sums (NaN as 0, like nanmean) and counts the non-NaN ones, in place."""
+    for i in range(values.shape[0]):
+        for j in range(values.shape[1]):
+            value = values[i, j]
+            if value == value:
+                sums[i, j] += value
+                counts[i, j] += 1
+
+def average_column(all_dataframes, column):
+    """
+    Average one column across all dataframes (per-column fallback path).
+    """
+    first_df = all_dataframes[0]
+    try:
+        column_values = []
+        for df in all_dataframes:
+            if column in df.columns:
+                column_values.append(pd.to_numeric(df[column], errors='coerce').values)
+        # np.asarray reads the dtype without copying the values (np.array copied every column)
+        if any(np.issubdtype(np.asarray(vals).dtype, np.number) for vals in column_values):
+            stacked_values = np.column_stack(column_values)
+            return np.nanmean(stacked_values, axis=1)
+        return first_df[column]
+    except Exception:
+        return first_df[column]
+
+def group_cache_path(cache_dir, group_name, csv_stats):
+    """
+    Cache file for a group's averages, named by a hash of CACHE_VERSION and its CSV paths, sizes and
+    modification times (csv_stats maps each CSV path to its os.stat result).
+    """
+    digest = hashlib.sha1(f"v{CACHE_VERSION}\n".encode())
+    for csv_path, stat in csv_stats.items():
+        digest.update(f"{csv_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return os.path.join(cache_dir, f"{group_name}_{digest.hexdigest()[:16]}.parquet")
+
+def remove_stale_group_caches(cache_dir, group_name, cache_path):
+    """
+    Delete the group's other cache files (written for earlier versions of its runs or of the code).
+    """
+    with os.scandir(cache_dir) as entries:
+        stale = [entry.path for entry in entries
+                 if entry.name.startswith(f"{group_name}_") and entry.name.endswith('.parquet') and entry.path != cache_path]
+    for path in stale:
+        os.remove(path)
+
+def average_runs(csv_paths, group_name, read_threads=1):
+    """
+    Read the runs of one group and average them; returns the averaged DataFrame, or None without data.
+    """
+    # The first run is read with type inference, the others with its column types.
+    # They are read by read_threads threads so their disk reads overlap (the parser releases the GIL);
+    # map keeps the folder order
+    first_run = read_run_csv(csv_paths[0]) if csv_paths else None
+    column_types = arrow_column_types(first_run) if first_run is not None else None
+    with ThreadPoolExecutor(max_workers=read_threads) as executor:
+        other_runs = executor.map(read_run_csv, csv_paths[1:], repeat(column_types))
+        all_dataframes = [df for df in [first_run, *other_runs] if df is not None]
+    if not all_dataframes:
+        print(f"Error: No valid CSV files found for group {group_name}")
+        return None
+    print(f"Successfully loaded {len(all_dataframes)} CSV files for group {group_name}")
+    first_df = all_dataframes[0]
+    # Columns that are numeric in every file are averaged in one go, as (n_rows, n_cols) blocks
+    numeric_columns = [column for column in first_df.select_dtypes('number').columns if column != 'Time']
+    if all(len(df) == len(first_df) for df in all_dataframes):
+        for df in all_dataframes[1:]:
+            df_numeric = set(df.select_dtypes('number').columns)
+            numeric_columns = [column for column in numeric_columns if column in df_numeric]
+    else:
+        numeric_columns = []
+    column_means = {}
+    if numeric_columns:
+        # Running NaN-skipping sum and count, one file at a time, instead of a
+        # (n_files, n_rows, n_cols) stack (same additions in the same order as nanmean over it);
+        # each later file is added in one compiled pass, without NaN masks or temporaries
+        values = all_dataframes[0][numeric_columns].to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        sums = np.where(present, values, 0.0)
+        counts = present.astype(np.intp)
+        for df in all_dataframes[1:]:
+            _add_present(sums, counts, df[numeric_columns].to_numpy(dtype=np.float64))
+        with np.errstate(invalid='ignore'):
+            means = sums / counts  # NaN where a value is missing in every file
+        column_means = {column: means[:, j] for j, column in enumerate(numeric_columns)}
+    averaged_data = {}
+    for column in first_df.columns:
+        if column == 'Time':
+            averaged_data[column] = first_df[column]
+        elif column in column_means:
+            averaged_data[column] = column_means[column]
+        else:
+            # Mixed / non-numeric columns keep the per-column handling
+            averaged_data[column] = average_column(all_dataframes, column)
+    return pd.DataFrame(averaged_data)
+
+def calculate_averages_for_group(input_dir, folders, group_name, use_cache=True, read_threads=1):
+    """
+    Average the simulation_output.csv of each of folders (under input_dir); returns the DataFrame, or None.
+    Unchanged runs (same paths, sizes and mtimes) reuse the averages cached in input_dir/cache,
+    which keeps only the latest cache file per group.
+    """
+    print(f"Processing group {group_name} with {len(folders)} folders...")
+    # One stat per run both checks that its CSV exists and gives the size and mtime for the cache key
+    csv_stats = {}
+    for folder in folders:
+        csv_path = os.path.normpath(os.path.join(input_dir, folder, 'simulation_output.csv'))
+        try:
+            csv_stats[csv_path] = os.stat(csv_path)
+        except OSError:
+            print(f"Warning: {csv_path} not found")
+    csv_paths = list(csv_stats)
+    cache_dir = os.path.normpath(os.path.join(input_dir, 'cache'))
+    cache_path = group_cache_path(cache_dir, group_name, csv_stats) if use_cache and csv_paths else None
+    if cache_path is not None and os.path.exists(cache_path):
+        print(f"Loaded cached averages for group {group_name} from {cache_path}")
+        return pd.read_parquet(cache_path)
+    averaged_df = average_runs(csv_paths, group_name, read_threads)
+    if averaged_df is not None and cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        averaged_df.to_parquet(cache_path, index=False)
+        remove_stale_group_caches(cache_dir, group_name, cache_path)
+    return averaged_df
+
+def process_one_group(input_dir, output_dir, dipbst_value, group_folders, use_cache=True, read_threads=1):
+    """
+    Average one DIPBst group and write its summary; returns the output filename, or None on failure.
+    """
+    averaged_df = calculate_averages_for_group(input_dir, group_folders, f"DIPBst{dipbst_value}", use_cache, read_threads)
+    if averaged_df is None:
+        return None
+    output_filename = os.path.join(output_dir, f"summary_DIPBst{dipbst_value}.csv")
+    averaged_df.to_csv(output_filename, index=False)
+    return output_filename
+
+def process_all(input_dir, output_dir, selected, use_cache=True):
+    """
+    Average every selected DIPBst group of run folders in input_dir into output_dir/summary_DIPBst<value>.csv.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    folders = get_all_folders(input_dir)
+    print(f"Found {len(folders)} folders")
+    groups = group_folders_by_dipbst(folders, selected)
+    print(f"Found {len(groups)} selected DIPBst values: {sorted(groups.keys())}")
+    dipbst_values = []
+    for dipbst_value in selected:
+        group_folders = groups.get(dipbst_value, [])
+        if not group_folders:
+            print(f"Warning: No folders found for DIPBst={dipbst_value}")
+            continue
+        if len(group_folders) != 30:
+            print(f"Warning: DIPBst={dipbst_value} has {len(group_folders)} folders (expected 30)")
+        dipbst_values.append(dipbst_value)
+    if not dipbst_values:
+        return
+    # The DIPBst groups are independent, so each one is read and averaged in its own worker process;
+    # the CPUs are split between the workers' reader threads so they don't oversubscribe them
+    n_cpus = os.cpu_count() or 1
+    n_workers = min(len(dipbst_values), n_cpus)
+    read_threads = max(1, n_cpus // n_workers)
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        output_filenames = executor.map(
+            process_one_group, repeat(input_dir), repeat(output_dir), dipbst_values,
+            [groups[dipbst_value] for dipbst_value in dipbst_values], repeat(use_cache), repeat(read_threads))
+        for dipbst_value, output_filename in zip(dipbst_values, output_filenames):
+            if output_filename is not None:
+                print(f"Saved {output_filename}")
+            else:
+                print(f"Failed to process group DIPBst{dipbst_value}")
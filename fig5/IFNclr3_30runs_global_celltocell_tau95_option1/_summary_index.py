@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Index and reading of the summary_DIPBst* files, shared by the plotting scripts.
+Import it before matplotlib.pyplot: it selects the plotting backend.
+"""
+
+import os
+import re
+import sys
+
+import matplotlib
+import pandas as pd
+
+# Figures are only saved to file unless run with --show on a display; Agg skips GUI backend startup
+show_figures = '--show' in sys.argv[1:] and bool(os.environ.get('DISPLAY'))
+if not show_figures:
+    matplotlib.use('Agg')
+
+SUMMARY_RE = re.compile(r'summary_DIPBst(\d+)\.(parquet|csv)')
+
+# Above this many curve vertices the PDF is smaller with the curves rasterized
+# (at 300 dpi) than stored as vector paths; below it they stay vector
+RASTERIZE_MIN_POINTS = 100_000
+
+def load_summary_index(summary_dir='.'):
+    """
+    Summary files in summary_dir as a DataFrame with columns [dipbst, path], sorted by dipbst.
+    Each DIPBst uses its parquet copy (faster to load) if it is at least as new as its CSV, otherwise the CSV.
+    """
+    found = {'parquet': {}, 'csv': {}}  # format -> {dipbst: (path, mtime_ns)}
+    with os.scandir(summary_dir) as entries:
+        for entry in entries:
+            match = SUMMARY_RE.fullmatch(entry.name)
+            if match and entry.is_file():
+                found[match.group(2)][int(match.group(1))] = (entry.path, entry.stat().st_mtime_ns)
+    rows = []
+    for dipbst in sorted(found['parquet'].keys() | found['csv'].keys()):
+        parquet = found['parquet'].get(dipbst)
+        csv = found['csv'].get(dipbst)
+        # A CSV rewritten after its parquet copy (e.g. by a summarizer that writes CSV only) wins
+        if parquet is not None and (csv is None or parquet[1] >= csv[1]):
+            rows.append((dipbst, parquet[0]))
+        else:
+            rows.append((dipbst, csv[0]))
+    return pd.DataFrame(rows, columns=['dipbst', 'path'])
+
+def read_summary(file, columns):
+    """Read the given (numeric) columns of a summary file, parquet or CSV."""
+    if file.endswith('.parquet'):
+        return pd.read_parquet(file, columns=columns)
+    # Fixed dtypes skip type inference; float64 like the parquet copies
+    return pd.read_csv(file, usecols=columns, dtype={column: 'float64' for column in columns}, engine='c')
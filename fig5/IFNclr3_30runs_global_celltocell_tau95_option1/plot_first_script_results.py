@@ -3,8 +3,9 @@
 Plot results from the first script (DIPBst 100-1600)
 """
 
-import os
 import pandas as pd
+# Selects the Agg backend unless run with --show on a display, so it comes before pyplot
+from _summary_index import show_figures, load_summary_index, read_summary, RASTERIZE_MIN_POINTS
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib import rcParams
@@ -17,27 +18,28 @@ plt.rcParams['xtick.major.width'] = 1.5
 plt.rcParams['ytick.major.width'] = 1.5
 
 def main():
-    # Get all summary files from the first script
-    summary_files = [f for f in os.listdir('.') if f.startswith('summary_DIPBst') and f.endswith('.csv') and os.path.isfile(f)]
-    summary_files.sort()
+    # Get all summary files from the first script (parquet copies when present), sorted by DIPBst
+    summary_index = load_summary_index()
     
-    print(f"Found {len(summary_files)} summary files")
+    print(f"Found {len(summary_index)} summary files")
     
     # Read and process data
     dipbst_values = []
     max_ifn_values = []
     all_data = []
+    burst_keys = []  # DIPBst each file's rows belong to (the integer part of its first BURST_SIZE_D value)
     
-    for file in summary_files:
+    for dipbst, file in summary_index.itertuples(index=False, name=None):
         try:
-            df = pd.read_csv(file)
-            dipbst = int(file.split('_')[1].replace('DIPBst', '').replace('.csv', ''))
+            df = read_summary(file, ['Time', 'Global IFN Concentration Per Cell', 'BURST_SIZE_D'])
             
             if 'Global IFN Concentration Per Cell' in df.columns:
                 max_ifn = df['Global IFN Concentration Per Cell'].max()
+                burst_key = int(df['BURST_SIZE_D'].iloc[0])
                 dipbst_values.append(dipbst)
                 max_ifn_values.append(max_ifn)
                 all_data.append(df)
+                burst_keys.append(burst_key)
                 print(f"DIPBst {dipbst}: Max IFN = {max_ifn:.6f}")
         except Exception as e:
             print(f"Error processing {file}: {e}")
@@ -47,13 +49,15 @@ def main():
         return
     
     # Sort by DIPBst values
-    sorted_data = sorted(zip(dipbst_values, max_ifn_values))
-    dipbst_values = [x[0] for x in sorted_data]
-    max_ifn_values = [x[1] for x in sorted_data]
+    dipbst_values = np.fromiter(dipbst_values, dtype=np.int64, count=len(dipbst_values))
+    max_ifn_values = np.fromiter(max_ifn_values, dtype=np.float64, count=len(max_ifn_values))
+    order = dipbst_values.argsort(kind='stable')
+    dipbst_values, max_ifn_values = dipbst_values[order], max_ifn_values[order]
     
     # Find maximum IFN value
-    max_ifn_overall = max(max_ifn_values)
-    max_dipbst = dipbst_values[max_ifn_values.index(max_ifn_overall)]
+    max_ifn_index = int(max_ifn_values.argmax())
+    max_ifn_overall = max_ifn_values[max_ifn_index]
+    max_dipbst = dipbst_values[max_ifn_index]
     
     print(f"\nMaximum IFN: {max_ifn_overall:.6f} at DIPBst = {max_dipbst}")
     
@@ -63,48 +67,44 @@ def main():
     # Plot 1: IFN levels over time for all DIPBst values
     print("\nGenerating IFN time series plot...")
     
-    # Combine all data for time series
-    combined_df = pd.concat(all_data, ignore_index=True)
+    # Combine all data for time series, tagging each file's rows with the DIPBst
+    # key taken when the file was read
+    combined_df = pd.concat(all_data, keys=burst_keys, names=['burst_key', None])
     time_points = combined_df['Time'].unique()
     time_points.sort()
     
-    # Create color map using matplotlib's blues
-    min_dipbst = min(dipbst_values)
-    max_dipbst_range = max(dipbst_values) - min_dipbst
+    # Mean IFN per (DIPBst, time) for all DIPBst values in one groupby;
+    # one column per DIPBst, 0 where a DIPBst has no data at a time point
+    ifn_by_burst = (combined_df.groupby(['burst_key', 'Time'])['Global IFN Concentration Per Cell'].mean()
+                    .unstack('burst_key', fill_value=0)
+                    .reindex(time_points, fill_value=0))
+    
+    # Create color map using matplotlib's blues (dipbst_values is sorted, so its ends are the range)
+    min_dipbst = dipbst_values[0]
+    max_dipbst_range = dipbst_values[-1] - min_dipbst
     blues_cmap = cm.get_cmap('Blues')
     
+    # Calculate colors based on DIPBst value using blues colormap, one lookup for all curves
+    # (0.3 to 0.9 for better contrast)
+    if max_dipbst_range > 0:
+        color_intensities = (dipbst_values - min_dipbst) / max_dipbst_range
+    else:
+        color_intensities = np.full(len(dipbst_values), 0.5)
+    curve_colors = blues_cmap(0.3 + 0.6 * color_intensities)
+    
     # Plot time series for each DIPBst
+    rasterize_curves = len(time_points) * len(dipbst_values) > RASTERIZE_MIN_POINTS
     for i, dipbst in enumerate(dipbst_values):
-        # Get data for this DIPBst
-        dipbst_data = []
-        for df in all_data:
-            if int(df['BURST_SIZE_D'].iloc[0]) == dipbst:
-                dipbst_data.append(df)
-        
-        if dipbst_data:
-            combined_dipbst = pd.concat(dipbst_data, ignore_index=True)
-            ifn_values = []
-            for time in time_points:
-                time_data = combined_dipbst[combined_dipbst['Time'] == time]
-                if not time_data.empty:
-                    ifn_values.append(time_data['Global IFN Concentration Per Cell'].mean())
-                else:
-                    ifn_values.append(0)
-            
-            # Calculate color based on DIPBst value using blues colormap
-            if max_dipbst_range > 0:
-                color_intensity = (dipbst - min_dipbst) / max_dipbst_range
-            else:
-                color_intensity = 0.5
+        if dipbst in ifn_by_burst.columns:
+            ifn_values = ifn_by_burst[dipbst].to_numpy()
             
-            # Get color from blues colormap (0.3 to 0.9 for better contrast)
-            color = blues_cmap(0.3 + 0.6 * color_intensity)
+            color = curve_colors[i]
             
             # Plot with different colors
             if dipbst == max_dipbst:
-                ax1.plot(time_points, ifn_values, color='red', linewidth=3, label=f'DIPBst {dipbst} (Max)', zorder=10)
+                ax1.plot(time_points, ifn_values, color='red', linewidth=3, label=f'DIPBst {dipbst} (Max)', zorder=10, rasterized=rasterize_curves)
             else:
-                ax1.plot(time_points, ifn_values, color=color, alpha=0.8, linewidth=1.5)
+                ax1.plot(time_points, ifn_values, color=color, alpha=0.8, linewidth=1.5, rasterized=rasterize_curves)
     
     ax1.set_xlabel('Time', fontsize=14)
     ax1.set_ylabel('Global IFN Concentration Per Cell', fontsize=14)
@@ -138,14 +138,15 @@ def main():
     ax2.grid(True, alpha=0.3)
     
     # Adjust layout and save
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save plots
     output_png = 'first_script_results.png'
     output_pdf = 'first_script_results.pdf'
     
-    plt.savefig(output_png, dpi=300, bbox_inches='tight')
-    plt.savefig(output_pdf, bbox_inches='tight')
+    fig.savefig(output_png, dpi=300, bbox_inches='tight')
+    # Dense time series are rasterized in the PDF at 300 dpi; text and axes stay vector
+    fig.savefig(output_pdf, dpi=300, bbox_inches='tight')
     
     print(f"\nPlots saved as:")
     print(f"  {output_png}")
@@ -154,11 +155,12 @@ def main():
     # Print summary statistics
     print(f"\n=== SUMMARY STATISTICS ===")
     print(f"Total DIPBst values: {len(dipbst_values)}")
-    print(f"DIPBst range: {min(dipbst_values)} - {max(dipbst_values)}")
-    print(f"IFN range: {min(max_ifn_values):.6f} - {max(max_ifn_values):.6f}")
+    print(f"DIPBst range: {dipbst_values[0]} - {dipbst_values[-1]}")
+    print(f"IFN range: {max_ifn_values.min():.6f} - {max_ifn_overall:.6f}")
     print(f"Optimal DIPBst: {max_dipbst} (IFN: {max_ifn_overall:.6f})")
     
-    plt.show()
+    if show_figures:
+        plt.show()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -5,58 +5,56 @@ Each line represents a different DIPBst value.
 """
 
 import pandas as pd
+import pyarrow.parquet as pq
+# Selects the Agg backend unless run with --show on a display, so it comes before pyplot
+from _summary_index import show_figures, load_summary_index, read_summary
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import numpy as np
-import glob
-import re
 
-def extract_dipbst_from_filename(filename):
-    """Extract DIPBst value from filename."""
-    match = re.search(r'DIPBst(\d+)', filename)
-    if match:
-        return int(match.group(1))
-    return None
+def summary_columns(file):
+    """Column names of a summary file (parquet schema or CSV header)."""
+    if file.endswith('.parquet'):
+        return pq.read_schema(file).names
+    return list(pd.read_csv(file, nrows=0).columns)
 
 def plot_ifn_levels():
     """Plot IFN levels over time for all summary files."""
     
-    # Get all summary files
-    summary_files = glob.glob('summary_DIPBst*.csv')
-    summary_files.sort()
+    # Get all summary files (parquet copies when present), sorted by DIPBst
+    summary_index = load_summary_index()
     
-    print(f"Found {len(summary_files)} summary files")
+    print(f"Found {len(summary_index)} summary files")
     
     # Create the plot
-    plt.figure(figsize=(12, 8))
+    fig = plt.figure(figsize=(12, 8))
     
     # Colors for different lines
-    colors = plt.cm.viridis(np.linspace(0, 1, len(summary_files)))
+    colors = plt.cm.viridis(np.linspace(0, 1, len(summary_index)))
     
     # Plot each summary file
-    for i, file in enumerate(summary_files):
+    lines, line_colors, legend_handles = [], [], []
+    for i, (dipbst_value, file) in enumerate(summary_index.itertuples(index=False, name=None)):
         try:
-            # Read the CSV file
-            df = pd.read_csv(file)
-            
-            # Extract DIPBst value from filename
-            dipbst_value = extract_dipbst_from_filename(file)
-            
-            # Get time and IFN level data
-            time = df['Time']
-            
             # Look for IFN-related columns
-            ifn_columns = [col for col in df.columns if 'IFN' in col.upper()]
+            ifn_columns = [col for col in summary_columns(file) if 'IFN' in col.upper()]
             print(f"File {file}: IFN columns found: {ifn_columns}")
             
             # Use the first IFN column found (usually 'Global IFN Concentration Per Cell')
             if ifn_columns:
+                # Read the summary file (only time and that column for parquet)
+                df = read_summary(file, ['Time', ifn_columns[0]])
+                
+                # Get time and IFN level data
+                time = df['Time']
                 ifn_level = df[ifn_columns[0]]
                 
-                # Plot the line
-                plt.plot(time, ifn_level, 
-                        label=f'DIPBst = {dipbst_value}', 
-                        color=colors[i], 
-                        linewidth=2)
+                # Collect the line; all of them are drawn as one LineCollection below
+                lines.append(np.column_stack([time, ifn_level]))
+                line_colors.append(colors[i])
+                legend_handles.append(Line2D([], [], color=colors[i], linewidth=2,
+                                             label=f'DIPBst = {dipbst_value}'))
                 
                 print(f"Plotted DIPBst = {dipbst_value}")
             else:
@@ -65,22 +63,26 @@ def plot_ifn_levels():
         except Exception as e:
             print(f"Error processing {file}: {e}")
     
+    ax = plt.gca()
+    ax.add_collection(LineCollection(lines, colors=line_colors, linewidths=2, zorder=2))
+    ax.autoscale_view()
+    
     # Customize the plot
     plt.xlabel('Time', fontsize=14)
     plt.ylabel('Global IFN Concentration Per Cell', fontsize=14)
     plt.title('IFN Levels Over Time for Different DIPBst Values', fontsize=16)
     plt.grid(True, alpha=0.3)
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
+    plt.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
     
     # Adjust layout to prevent label cutoff
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save the plot
-    plt.savefig('ifn_levels_comparison.png', dpi=300, bbox_inches='tight')
+    fig.savefig('ifn_levels_comparison.png', dpi=300, bbox_inches='tight')
     print("Plot saved as 'ifn_levels_comparison.png'")
     
-    # Show the plot
-    plt.show()
+    if show_figures:
+        plt.show()
 
 if __name__ == "__main__":
     plot_ifn_levels()
\ No newline at end of file
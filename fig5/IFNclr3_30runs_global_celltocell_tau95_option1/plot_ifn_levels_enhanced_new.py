@@ -4,19 +4,12 @@ Enhanced script to plot IFN levels over time from summary CSV files.
 Each line represents a different DIPBst value with better visualization.
 """
 
-import pandas as pd
+# Selects the Agg backend unless run with --show on a display, so it comes before pyplot
+from _summary_index import show_figures, load_summary_index, read_summary, RASTERIZE_MIN_POINTS
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import numpy as np
-import glob
-import re
-import os
-
-def extract_dipbst_from_filename(filename):
-    """Extract DIPBst value from filename."""
-    match = re.search(r'DIPBst(\d+)', filename)
-    if match:
-        return int(match.group(1))
-    return None
 
 def plot_ifn_levels_enhanced():
     """Plot IFN levels over time for all summary files with enhanced styling."""
@@ -24,28 +17,27 @@ def plot_ifn_levels_enhanced():
     # Set style for better looking plots
     plt.style.use('default')
     
-    # Get all summary files from the current directory
-    summary_dir = '.'
-    summary_files = [os.path.join(summary_dir, f) for f in os.listdir(summary_dir) if f.startswith('summary_DIPBst') and f.endswith('.csv') and os.path.isfile(os.path.join(summary_dir, f))]
-    summary_files.sort()
+    # Get all summary files from the current directory (parquet copies when present), sorted by DIPBst
+    summary_index = load_summary_index('.')
     
-    print(f"Found {len(summary_files)} summary files")
+    print(f"Found {len(summary_index)} summary files")
     
     # Create the plot
-    plt.figure(figsize=(12, 8))
+    fig = plt.figure(figsize=(12, 8))
     
     # Colors for different lines
-    colors = plt.cm.viridis(np.linspace(0, 1, len(summary_files)))
+    colors = plt.cm.viridis(np.linspace(0, 1, len(summary_index)))
     
     # Track maximum IFN values to find the highest
     max_ifn_values = []
     dipbst_values = []
     
-    # Plot each summary file
-    for i, file in enumerate(summary_files):
+    # Collect each summary file's curve; all are drawn as one LineCollection below
+    lines, line_colors, line_widths = [], [], []
+    legend_handles = []
+    for i, (dipbst_value, file) in enumerate(summary_index.itertuples(index=False, name=None)):
         try:
-            df = pd.read_csv(file)
-            dipbst_value = extract_dipbst_from_filename(file)
+            df = read_summary(file, ['Time', 'Global IFN Concentration Per Cell'])
             
             if 'Global IFN Concentration Per Cell' in df.columns:
                 # Find the maximum IFN value for this DIPBst
@@ -53,11 +45,12 @@ def plot_ifn_levels_enhanced():
                 max_ifn_values.append(max_ifn)
                 dipbst_values.append(dipbst_value)
                 
-                # Plot the line
-                plt.plot(df['Time'], df['Global IFN Concentration Per Cell'], 
-                        color=colors[i], 
-                        linewidth=2, 
-                        label=f'DIPBst = {dipbst_value}')
+                # (n, 2) array of (time, IFN) points, reused for the red max line below
+                lines.append(df[['Time', 'Global IFN Concentration Per Cell']].to_numpy())
+                line_colors.append(colors[i])
+                line_widths.append(2)
+                legend_handles.append(Line2D([], [], color=colors[i], linewidth=2,
+                                             label=f'DIPBst = {dipbst_value}'))
                 
                 print(f"DIPBst = {dipbst_value}, Max IFN = {max_ifn:.6f}")
             else:
@@ -68,36 +61,40 @@ def plot_ifn_levels_enhanced():
     
     # Find the DIPBst with maximum IFN
     if max_ifn_values:
-        max_idx = np.argmax(max_ifn_values)
+        max_ifn_arr = np.fromiter(max_ifn_values, dtype=np.float64, count=len(max_ifn_values))
+        max_idx = int(max_ifn_arr.argmax())
         max_dipbst = dipbst_values[max_idx]
-        max_ifn = max_ifn_values[max_idx]
+        max_ifn = max_ifn_arr[max_idx]
         
-        # Replot the maximum line in red
-        for i, file in enumerate(summary_files):
-            df = pd.read_csv(file)
-            dipbst_value = extract_dipbst_from_filename(file)
-            
-            if dipbst_value == max_dipbst and 'Global IFN Concentration Per Cell' in df.columns:
-                plt.plot(df['Time'], df['Global IFN Concentration Per Cell'], 
-                        color='red', 
-                        linewidth=3, 
-                        label=f'DIPBst = {dipbst_value} (Max IFN)')
-                break
+        # Draw the maximum line again in red, last so it sits on top;
+        # its curve is already in memory from the loop above
+        lines.append(lines[max_idx])
+        line_colors.append('red')
+        line_widths.append(3)
+        legend_handles.append(Line2D([], [], color='red', linewidth=3,
+                                     label=f'DIPBst = {max_dipbst} (Max IFN)'))
         
         print(f"\nMaximum IFN: DIPBst = {max_dipbst}, IFN = {max_ifn:.6f}")
     
+    ax = plt.gca()
+    ax.add_collection(LineCollection(lines, colors=line_colors, linewidths=line_widths, zorder=2,
+                                     rasterized=sum(map(len, lines)) > RASTERIZE_MIN_POINTS))
+    ax.autoscale_view()
+    
     # Customize the plot
     plt.xlabel('Time', fontsize=14)
     plt.ylabel('IFN Level', fontsize=14)
     plt.title('IFN Levels Over Time for Different DIPBst Values', fontsize=16, fontweight='bold')
     plt.grid(True, alpha=0.3)
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
+    plt.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.tight_layout()
     
     # Save the plot
-    plt.savefig('ifn_levels_comparison_enhanced_new.png', dpi=300, bbox_inches='tight')
-    plt.savefig('ifn_levels_comparison_enhanced_new.pdf', bbox_inches='tight')
-    plt.show()
+    fig.savefig('ifn_levels_comparison_enhanced_new.png', dpi=300, bbox_inches='tight')
+    # Dense curves are rasterized in the PDF at 300 dpi; text and axes stay vector
+    fig.savefig('ifn_levels_comparison_enhanced_new.pdf', dpi=300, bbox_inches='tight')
+    if show_figures:
+        plt.show()
     
     print("\nPlots saved as:")
     print("- ifn_levels_comparison_enhanced_new.png")
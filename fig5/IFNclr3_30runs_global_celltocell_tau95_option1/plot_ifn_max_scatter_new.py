@@ -4,19 +4,11 @@ Script to create a stem plot of IFN maximum values vs DIPBst values.
 Each point represents a DIPBst value with its corresponding maximum IFN level.
 """
 
-import pandas as pd
+# Selects the Agg backend unless run with --show on a display, so it comes before pyplot
+from _summary_index import show_figures, load_summary_index, read_summary
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import numpy as np
-import glob
-import re
-import os
-
-def extract_dipbst_from_filename(filename):
-    """Extract DIPBst value from filename."""
-    match = re.search(r'DIPBst(\d+)', filename)
-    if match:
-        return int(match.group(1))
-    return None
 
 def plot_ifn_max_stem():
     """Create stem plot of IFN maximum values vs DIPBst values."""
@@ -24,21 +16,18 @@ def plot_ifn_max_stem():
     # Set style for better looking plots
     plt.style.use('default')
     
-    # Get all summary files from the current directory
-    summary_dir = '.'
-    summary_files = [os.path.join(summary_dir, f) for f in os.listdir(summary_dir) if f.startswith('summary_DIPBst') and f.endswith('.csv') and os.path.isfile(os.path.join(summary_dir, f))]
-    summary_files.sort()
+    # Get all summary files from the current directory (parquet copies when present), sorted by DIPBst
+    summary_index = load_summary_index('.')
     
-    print(f"Found {len(summary_files)} summary files")
+    print(f"Found {len(summary_index)} summary files")
     
     # Extract DIPBst values and maximum IFN values
     dipbst_values = []
     max_ifn_values = []
     
-    for file in summary_files:
+    for dipbst_value, file in summary_index.itertuples(index=False, name=None):
         try:
-            df = pd.read_csv(file)
-            dipbst_value = extract_dipbst_from_filename(file)
+            df = read_summary(file, ['Global IFN Concentration Per Cell'])
             
             if 'Global IFN Concentration Per Cell' in df.columns:
                 max_ifn = df['Global IFN Concentration Per Cell'].max()
@@ -56,38 +45,41 @@ def plot_ifn_max_stem():
         return
     
     # Find the maximum IFN value
-    max_idx = np.argmax(max_ifn_values)
-    max_dipbst = dipbst_values[max_idx]
-    max_ifn = max_ifn_values[max_idx]
+    dipbst_arr = np.fromiter(dipbst_values, dtype=np.int64, count=len(dipbst_values))
+    max_arr = np.fromiter(max_ifn_values, dtype=np.float64, count=len(max_ifn_values))
+    max_idx = int(max_arr.argmax())
+    max_dipbst = dipbst_arr[max_idx]
+    max_ifn = max_arr[max_idx]
     
     print(f"\nMaximum IFN: DIPBst = {max_dipbst}, IFN = {max_ifn:.6f}")
     
     # Create the stem plot
-    plt.figure(figsize=(12, 8))
+    fig = plt.figure(figsize=(12, 8))
+    ax = plt.gca()
+    
+    # One vlines call for all stems and one scatter for all points:
+    # red for the maximum, black for the others
+    is_max = dipbst_arr == max_dipbst
+    stem_colors = np.where(is_max[:, None], [1, 0, 0, 0.7], [0, 0, 0, 0.5])
+    point_colors = np.where(is_max[:, None], [1, 0, 0, 1.0], [0, 0, 0, 1.0])
     
-    # Plot stems for all points (black)
-    for i, (dipbst, max_ifn) in enumerate(zip(dipbst_values, max_ifn_values)):
-        if dipbst == max_dipbst:
-            # Red for maximum
-            plt.plot([dipbst, dipbst], [0, max_ifn], 'r-', linewidth=3, alpha=0.7)
-            plt.plot(dipbst, max_ifn, 'ro', markersize=10, label=f'DIPBst = {dipbst} (Max IFN)' if i == max_idx else "")
-        else:
-            # Black for others
-            plt.plot([dipbst, dipbst], [0, max_ifn], 'k-', linewidth=2, alpha=0.5)
-            plt.plot(dipbst, max_ifn, 'ko', markersize=8)
+    ax.vlines(dipbst_arr, 0, max_arr, colors=stem_colors, linewidths=np.where(is_max, 3, 2), zorder=2)
+    ax.scatter(dipbst_arr, max_arr, c=point_colors, s=np.where(is_max, 100, 64), linewidths=1.0, zorder=2)
     
     # Customize the plot
     plt.xlabel('DIPBst Value', fontsize=14)
     plt.ylabel('IFN Maximum Value', fontsize=14)
     plt.title('IFN Maximum Values vs DIPBst Values', fontsize=16, fontweight='bold')
     plt.grid(True, alpha=0.3)
-    plt.legend()
-    plt.tight_layout()
+    plt.legend(handles=[Line2D([], [], color='red', marker='o', markersize=10, linestyle='none',
+                               label=f'DIPBst = {max_dipbst} (Max IFN)')])
+    fig.tight_layout()
     
     # Save the plot
-    plt.savefig('ifn_max_vs_dipbst_stem_new.png', dpi=300, bbox_inches='tight')
-    plt.savefig('ifn_max_vs_dipbst_stem_new.pdf', bbox_inches='tight')
-    plt.show()
+    fig.savefig('ifn_max_vs_dipbst_stem_new.png', dpi=300, bbox_inches='tight')
+    fig.savefig('ifn_max_vs_dipbst_stem_new.pdf', bbox_inches='tight')
+    if show_figures:
+        plt.show()
     
     print("\nPlots saved as:")
     print("- ifn_max_vs_dipbst_stem_new.png")
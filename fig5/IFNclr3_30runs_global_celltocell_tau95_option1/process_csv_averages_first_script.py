@@ -8,81 +8,122 @@ import pandas as pd
 import numpy as np
 from collections import defaultdict
 import re
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from concurrent.futures import ProcessPoolExecutor
+
+# Directory containing the simulation results
+BASE_DIR = 'IFNclr3_30runs_global_celltocell_tau95_option1'
+DIPBST_RE = re.compile(r'DIPBst(\d+)')
 
 def extract_dipbst_from_folder(folder_name):
     """Extract DIPBst value from folder name"""
-    match = re.search(r'DIPBst(\d+)', folder_name)
+    match = DIPBST_RE.search(folder_name)
     if match:
         return int(match.group(1))
     return None
 
-def main():
-    # Directory containing the simulation results
-    base_dir = 'IFNclr3_30runs_global_celltocell_tau95_option1'
+def process_dipbst(dipbst, folders):
+    """Average every CSV of one DIPBst group (one list of CSV paths per folder); returns the summary row as a dict, or None"""
+    # Running per-column sums and non-NaN counts, so only one run is in memory at a time
+    # (same result as the mean of all runs concatenated, without building that frame).
+    # Each run is aggregated column by column on the Arrow table, without a pandas DataFrame.
+    numeric_sums = defaultdict(int)
+    numeric_counts = defaultdict(int)
+    first_values = {}  # column -> first value, in first-seen column order
+    non_numeric = set()
+    
+    for csv_paths in folders:
+        for file_path in csv_paths:
+            try:
+                # pyarrow's multithreaded parser (releases the GIL), reading the memory-mapped
+                # file directly instead of copying it through read() buffers
+                with pa.memory_map(file_path) as source:
+                    table = pacsv.read_csv(source)
+            except Exception as e:
+                print(f"Error reading {file_path}: {e}")
+                continue
+            
+            # A column missing from the first run starts with NaN in the concatenated frame
+            is_first_run = not first_values
+            for column, values in zip(table.column_names, table.columns):
+                if column not in first_values:
+                    first_values[column] = values[0].as_py() if is_first_run and len(values) else np.nan
+                # A column that is empty / all "NaN" in this run has Arrow's null type; pandas reads it
+                # as float64 NaN, so it adds nothing to the sum or count and doesn't make the column non-numeric
+                if pa.types.is_null(values.type):
+                    continue
+                # int64/float64 are the columns pandas would read as numeric
+                if values.type not in (pa.int64(), pa.float64()):
+                    non_numeric.add(column)
+                    continue
+                # Missing values (the parser reads "", "nan", "NaN", ... as null) become NaN here
+                # and are skipped, like pandas' sum/count; the count comes from Arrow's null count,
+                # so no NaN mask is built per column
+                numeric_sums[column] += np.nansum(values.to_numpy())
+                numeric_counts[column] += len(values) - values.null_count
+    
+    if not first_values:
+        return None
+    
+    # Calculate averages for numeric columns
+    summary_data = {}
+    
+    for column, first_value in first_values.items():
+        if column not in non_numeric:
+            count = numeric_counts[column]
+            summary_data[column] = numeric_sums[column] / count if count else np.nan
+        else:
+            # For non-numeric columns, take the first value
+            summary_data[column] = first_value
     
+    return summary_data
+
+def main():
     # Group folders by DIPBst value
     dipbst_groups = defaultdict(list)
     
     # Find all folders that contain CSV files
-    for item in os.listdir(base_dir):
-        if os.path.isdir(os.path.join(base_dir, item)) and item.startswith(('4', '5', '6', '7', '8', '9')):
-            # Check if folder contains CSV files
-            folder_path = os.path.join(base_dir, item)
-            csv_files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
-            if csv_files:
-                dipbst = extract_dipbst_from_folder(item)
-                if dipbst:
-                    dipbst_groups[dipbst].append(item)
+    # scandir gives the entry type from the directory listing, so no os.path.isdir stat per entry;
+    # each folder's CSV paths are kept so the workers don't list the folder again
+    with os.scandir(BASE_DIR) as entries:
+        for entry in entries:
+            if entry.name.startswith(('4', '5', '6', '7', '8', '9')) and entry.is_dir():
+                # Check if folder contains CSV files
+                with os.scandir(entry.path) as folder_entries:
+                    csv_paths = [e.path for e in folder_entries if e.name.endswith('.csv') and e.is_file()]
+                if csv_paths:
+                    dipbst = extract_dipbst_from_folder(entry.name)
+                    if dipbst:
+                        dipbst_groups[dipbst].append(csv_paths)
     
     print(f"Found {len(dipbst_groups)} different DIPBst values")
     
-    # Process each DIPBst group
-    for dipbst in sorted(dipbst_groups.keys()):
-        folders = dipbst_groups[dipbst]
-        print(f"Processing DIPBst {dipbst} with {len(folders)} folders...")
-        
-        # Collect all CSV files for this DIPBst
-        all_data = []
-        
-        for folder in folders:
-            folder_path = os.path.join(base_dir, folder)
-            csv_files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
-            for csv_file in csv_files:
-                file_path = os.path.join(folder_path, csv_file)
-                try:
-                    df = pd.read_csv(file_path)
-                    all_data.append(df)
-                except Exception as e:
-                    print(f"Error reading {file_path}: {e}")
-        
-        if all_data:
-            # Combine all data
-            combined_df = pd.concat(all_data, ignore_index=True)
-            
-            # Calculate averages for numeric columns
-            summary_data = {}
-            
-            for column in combined_df.columns:
-                if combined_df[column].dtype in ['int64', 'float64']:
-                    summary_data[column] = combined_df[column].mean()
-                else:
-                    # For non-numeric columns, take the first value
-                    summary_data[column] = combined_df[column].iloc[0]
+    # DIPBst groups are independent, so each one is read and averaged in its own worker process
+    dipbst_values = sorted(dipbst_groups.keys())
+    for dipbst in dipbst_values:
+        print(f"Processing DIPBst {dipbst} with {len(dipbst_groups[dipbst])} folders...")
+    
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        summaries = executor.map(process_dipbst, dipbst_values, [dipbst_groups[dipbst] for dipbst in dipbst_values])
+        for dipbst, summary_data in zip(dipbst_values, summaries):
+            if summary_data is None:
+                print(f"No valid CSV data found for DIPBst {dipbst}")
+                continue
             
             # Create summary DataFrame
             summary_df = pd.DataFrame([summary_data])
             
-            # Save summary file
+            # Save summary file (CSV for reading, parquet for the plotting scripts)
             output_filename = f'summary_DIPBst{dipbst}.csv'
             summary_df.to_csv(output_filename, index=False)
+            summary_df.to_parquet(f'summary_DIPBst{dipbst}.parquet', engine='pyarrow', compression='snappy', index=False)
             print(f"Created {output_filename}")
             
             # Print max IFN value
             if 'Global IFN Concentration Per Cell' in summary_df.columns:
                 max_ifn = summary_df['Global IFN Concentration Per Cell'].iloc[0]
                 print(f"  Max IFN for DIPBst {dipbst}: {max_ifn}")
-        else:
-            print(f"No valid CSV data found for DIPBst {dipbst}")
     
     print("\nSummary files generation completed!")
 
@@ -0,0 +1,113 @@
+"""
+Discovery and loading of the per-run Time / global IFN series, shared by
+6_plot_avg_ifn_dynamics.py and 7_combined_ifn_analysis_plot.py.
+"""
+import os
+import re
+import numpy as np
+import pandas as pd
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+
+IFN_COL = 'Global IFN Concentration Per Cell'
+# Only the two columns used by the plots are parsed (pyarrow's multithreaded C++ reader)
+CSV_READ_OPTIONS = pacsv.ReadOptions(use_threads=True)
+CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(include_columns=['Time', IFN_COL])
+# Simulation folder names, e.g. '12_DIPBst300_...' (same set as glob '[0-9]*_DIPBst*')
+SIM_DIR_RE = re.compile(r'^\d.*?_DIPBst(\d+)')
+# Written by 0_materialize_sims.py; used instead of the CSV tree when present
+MATERIALIZED_PATH = 'all_sims.parquet'
+
+def read_ifn_table(csv_path):
+    """Reads the Time and global IFN columns of a simulation_output.csv as an Arrow table."""
+    return pacsv.read_csv(csv_path, read_options=CSV_READ_OPTIONS, convert_options=CSV_CONVERT_OPTIONS)
+
+def find_all_simulation_dirs(root_dir='.'):
+    """Find all simulation directories across all replicate folders."""
+    # Correcting the path based on the user-provided directory structure
+    base_path = os.path.join(root_dir, 'IFNclr3_30runs_global_celltocell_tau95_option1', 'IFNclr3_30runs_global_celltocell_tau95_option1')
+
+    if not os.path.isdir(base_path):
+        print(f"Error: The target directory does not exist: {base_path}")
+        return []
+
+    # One scandir pass (dirent type, no extra stat per entry); the burst size is parsed here
+    # so grouping doesn't have to match every name again
+    with os.scandir(base_path) as entries:
+        return [(entry.path, int(m.group(1))) for entry in entries
+                if (m := SIM_DIR_RE.match(entry.name)) and entry.is_dir()]
+
+def group_simulations_by_burst_size(sim_dirs, target_burst_sizes):
+    """Groups simulation file paths by their DIP burst size (sim_dirs holds (path, burst_size) pairs)."""
+    grouped_files = {size: [] for size in target_burst_sizes}
+
+    for sim_dir, burst_size in sim_dirs:
+        if burst_size in grouped_files:
+            csv_path = os.path.join(sim_dir, 'simulation_output.csv')
+            if os.path.exists(csv_path):
+                grouped_files[burst_size].append(csv_path)
+
+    return grouped_files
+
+def load_materialized_runs(target_burst_sizes, root_dir='.'):
+    """Reads the runs of the main replicate folder from MATERIALIZED_PATH (see 0_materialize_sims.py).
+
+    Returns ({burst_size: [run_key, ...]}, {run_key: (time, ifn)}), or None if the file is absent.
+    Runs whose IFN column is all missing are left out.
+    """
+    if not os.path.exists(MATERIALIZED_PATH):
+        return None
+    print(f"Reading materialized runs from {MATERIALIZED_PATH}")
+    base_path = os.path.normpath(os.path.join(root_dir, 'IFNclr3_30runs_global_celltocell_tau95_option1', 'IFNclr3_30runs_global_celltocell_tau95_option1'))
+    df = pq.read_table(MATERIALIZED_PATH, columns=['sim_dir', 'burst_size_DIP', 'Time', IFN_COL],
+                       filters=[('replicate_dir', '=', base_path), ('burst_size_DIP', 'in', target_burst_sizes)]).to_pandas()
+    grouped_files = {size: [] for size in target_burst_sizes}
+    series = {}
+    for sim_dir, run in df.groupby('sim_dir', sort=False, observed=True):
+        ifn = run[IFN_COL].to_numpy()
+        # A run without any IFN value has no peak; it is skipped, like an unreadable CSV
+        if np.isnan(ifn).all():
+            print(f"Warning: No IFN values for {sim_dir}")
+            continue
+        grouped_files[run['burst_size_DIP'].iat[0]].append(sim_dir)
+        series[sim_dir] = (run['Time'].to_numpy(), ifn)
+    return grouped_files, series
+
+def load_ifn_series(csv_path):
+    """Loads the (Time, IFN) columns of one run as numpy arrays (runs in a worker process)."""
+    table = read_ifn_table(csv_path)
+    return table.column('Time').to_numpy(), table.column(IFN_COL).to_numpy()
+
+def iter_burst_runs(grouped_files, series=None, load_run=load_ifn_series, from_series=None):
+    """Yields (burst_size, [run, ...]) one burst size at a time, so only that burst's runs are held.
+
+    Each CSV is read with load_run(csv_path) in a worker process (so it must be a module-level function);
+    with materialized series, from_series(time, ifn) builds the run instead (the (time, ifn) pair by default).
+    Runs that come back as None are dropped.
+    """
+    if series is not None:
+        for burst_size, paths in grouped_files.items():
+            runs = (series[p] if from_series is None else from_series(*series[p]) for p in paths)
+            yield burst_size, [run for run in runs if run is not None]
+        return
+    all_paths = [p for paths in grouped_files.values() for p in paths]
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # map() returns results in submission order, i.e. burst by burst
+        results = iter(tqdm(executor.map(load_run, all_paths, chunksize=16), total=len(all_paths), desc="Reading simulation runs"))
+        for burst_size, paths in grouped_files.items():
+            yield burst_size, [run for run in (next(results) for _ in paths) if run is not None]
+
+def average_by_time(runs):
+    """Averages IFN across runs at each time point (same result as concat + groupby('Time').mean())."""
+    time_grid = runs[0][0]
+    if all(len(time) == len(time_grid) and np.array_equal(time, time_grid) for time, _ in runs):
+        # Replicates share one time grid: stack into (n_runs, n_times) and reduce down the columns,
+        # skipping missing samples like the groupby mean
+        ifn_matrix = np.stack([np.asarray(ifn) for _, ifn in runs])
+        return pd.Series(np.nanmean(ifn_matrix, axis=0), index=pd.Index(time_grid, name='Time'), name=IFN_COL)
+    # Grids differ between runs: fall back to grouping on the Time values
+    times = np.concatenate([time for time, _ in runs])
+    ifns = np.concatenate([ifn for _, ifn in runs])
+    return pd.Series(ifns, name=IFN_COL).groupby(pd.Index(times, name='Time')).mean()
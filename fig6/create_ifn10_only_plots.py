@@ -1,56 +1,88 @@
 import pandas as pd
+import matplotlib
+# The plots are only written to PNG files: Agg skips GUI backend startup, also in the worker processes
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def create_ifn10_integrated_linear():
+plt.ioff()  # no interactive redraws; figures are drawn once, at savefig
+
+# Text sizes shared by all four plots, set once instead of on every axis
+plt.rcParams.update({
+    'axes.labelsize': 34,
+    'axes.titlesize': 38,
+    'axes.titleweight': 'bold',
+    'xtick.labelsize': 32,
+    'ytick.labelsize': 32,
+    'legend.fontsize': 22,
+})
+
+# --draft saves at 150 dpi for quick looks. PNGs are compressed with zlib level 1:
+# the pixels are the same, the files ~40% larger but much faster to write
+save_dpi = 150 if '--draft' in sys.argv[1:] else 300
+png_kwargs = {'compress_level': 1, 'optimize': False}
+
+# kjumpr=0 (baseline - no jump) and the IFN1–IFN10 runs with jump (kjumpr=0.01)
+kjumpr_0_file = "kjumpr_0_local_dip_averaged_simulation_output.csv"
+base_dir = "kjumpr_0.01_vary_ifn_range_local_dip"
+plot_columns = ['Time', 'Percentage Dead Cells', 'Percentage Antiviral Cells']
+
+def ifn_run_file(i):
+    """simulation_output.csv of the IFN{i} run with jump."""
+    folder = f"{i}_Dinit0_DIPBst50_JRand_Vinit1_VBst100_IFN{i}_mdbk_times500_tau12_ifnBothFold1.00_grid76_VStimulateIFNtrue"
+    return os.path.join(base_dir, folder, "simulation_output.csv")
+
+def load_csv(path, description):
+    """Read the plotted columns of a CSV; returns None (after reporting it) if it cannot be read."""
+    try:
+        return pd.read_csv(path, usecols=plot_columns)
+    except Exception as e:
+        print(f"Error reading {description}: {e}")
+        return None
+
+def _decimate(t, y, max_pts=2000):
+    """Every step-th point (and the last) of a series longer than max_pts, for the thick plot lines."""
+    step = max(1, len(t) // max_pts)
+    if step == 1:
+        return t, y
+    idx = np.arange(0, len(t), step)
+    if idx[-1] != len(t) - 1:
+        idx = np.append(idx, len(t) - 1)
+    return t[idx], y[idx]
+
+def create_ifn10_integrated_linear(df_ifn10, df_baseline):
     """Create an integrated plot with only IFN10 data (linear scale)."""
-    
-    # Define the file paths
-    # kjumpr=0 (baseline - no jump)
-    kjumpr_0_file = "kjumpr_0_local_dip_averaged_simulation_output.csv"
-    
-    # IFN10 with jump (kjumpr=0.01)
-    base_dir = "kjumpr_0.01_vary_ifn_range_local_dip"
-    ifn10_folder = "10_Dinit0_DIPBst50_JRand_Vinit1_VBst100_IFN10_mdbk_times500_tau12_ifnBothFold1.00_grid76_VStimulateIFNtrue"
-    ifn10_file = os.path.join(base_dir, ifn10_folder, "simulation_output.csv")
+    print("\n1. Creating linear scale plot...")
     
     # Create figure with space for legend on the right
     fig, ax = plt.subplots(figsize=(18, 12))
     
     # Plot IFN10 with jump
-    try:
-        df_ifn10 = pd.read_csv(ifn10_file)
-        
+    if df_ifn10 is not None:
         # Dead cells - dark red
-        ax.plot(df_ifn10['Time'], df_ifn10['Percentage Dead Cells'], 
+        ax.plot(*_decimate(df_ifn10['Time'].values, df_ifn10['Percentage Dead Cells'].values), 
                color='darkred', linewidth=10, 
                label='IFN10 Dead (with $\mathbf{1\%\ jump}$)', linestyle='-', alpha=0.9)
         
         # Antiviral cells - dark blue
-        ax.plot(df_ifn10['Time'], df_ifn10['Percentage Antiviral Cells'], 
+        ax.plot(*_decimate(df_ifn10['Time'].values, df_ifn10['Percentage Antiviral Cells'].values), 
                color='darkblue', linewidth=10, 
                label='IFN10 Antiviral (with $\mathbf{1\%\ jump}$)', linestyle='-', alpha=0.9)
-        
-    except Exception as e:
-        print(f"Error reading IFN10 file: {e}")
     
     # Plot baseline (no jump)
-    try:
-        df_baseline = pd.read_csv(kjumpr_0_file)
-        
+    if df_baseline is not None:
         # Dead cells - orange
-        ax.plot(df_baseline['Time'], df_baseline['Percentage Dead Cells'], 
+        ax.plot(*_decimate(df_baseline['Time'].values, df_baseline['Percentage Dead Cells'].values), 
                color='darkorange', linewidth=12, 
                label='IFN10Dead ($\mathbf{no\ jump}$)', linestyle='--', alpha=0.95)
         
         # Antiviral cells - dark turquoise
-        ax.plot(df_baseline['Time'], df_baseline['Percentage Antiviral Cells'], 
+        ax.plot(*_decimate(df_baseline['Time'].values, df_baseline['Percentage Antiviral Cells'].values), 
                color='darkturquoise', linewidth=12, 
                label='IFN10Antiviral ($\mathbf{no\ jump}$)', linestyle='--', alpha=0.95)
-        
-    except Exception as e:
-        print(f"Error reading baseline file: {e}")
     
     # Add annotations
     ax.text(0.02, 0.95, 'Red/Orange: Dead Cells', transform=ax.transAxes,
@@ -62,16 +94,12 @@ def create_ifn10_integrated_linear():
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
     
     # Set labels and title
-    ax.set_xlabel('Time (hours)', fontsize=34, fontweight='normal')
-    ax.set_ylabel('Percentage of Cells (%)', fontsize=34, fontweight='normal')
-    ax.set_title('IFN10 Only: Dead and Antiviral Cells Dynamics (Linear Scale)\nComparing 1% Jump vs No Jump', 
-                fontsize=38, fontweight='bold', pad=30)
-    
-    # Set tick label sizes
-    ax.tick_params(axis='both', which='major', labelsize=32)
+    ax.set_xlabel('Time (hours)')
+    ax.set_ylabel('Percentage of Cells (%)')
+    ax.set_title('IFN10 Only: Dead and Antiviral Cells Dynamics (Linear Scale)\nComparing 1% Jump vs No Jump', pad=30)
     
     # Place legend outside the plot area (to the right)
-    ax.legend(bbox_to_anchor=(1.02, 1), loc='upper left', fontsize=22, 
+    ax.legend(bbox_to_anchor=(1.02, 1), loc='upper left', 
              frameon=True, fancybox=True, shadow=True, ncol=1)
     
     # Add grid for better readability
@@ -88,74 +116,50 @@ def create_ifn10_integrated_linear():
     
     # Save plot with extra space for legend
     output_filename = 'ifn10_only_integrated_linear_plot.png'
-    plt.savefig(output_filename, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.savefig(output_filename, dpi=save_dpi, bbox_inches='tight', facecolor='white', pil_kwargs=png_kwargs)
     plt.close()
     print(f"Saved: {output_filename}")
 
-def create_ifn10_integrated_log10():
+def create_ifn10_integrated_log10(df_ifn10, df_baseline):
     """Create an integrated plot with only IFN10 data (log10 scale)."""
-    
-    # Define the file paths
-    # kjumpr=0 (baseline - no jump)
-    kjumpr_0_file = "kjumpr_0_local_dip_averaged_simulation_output.csv"
-    
-    # IFN10 with jump (kjumpr=0.01)
-    base_dir = "kjumpr_0.01_vary_ifn_range_local_dip"
-    ifn10_folder = "10_Dinit0_DIPBst50_JRand_Vinit1_VBst100_IFN10_mdbk_times500_tau12_ifnBothFold1.00_grid76_VStimulateIFNtrue"
-    ifn10_file = os.path.join(base_dir, ifn10_folder, "simulation_output.csv")
+    print("\n2. Creating log10 scale plot...")
     
     # Create figure with space for legend on the right
     fig, ax = plt.subplots(figsize=(18, 12))
     
     # Plot IFN10 with jump
-    try:
-        df_ifn10 = pd.read_csv(ifn10_file)
-        
-        # Handle log10 transformation
-        dead_values = df_ifn10['Percentage Dead Cells'].values
-        antiviral_values = df_ifn10['Percentage Antiviral Cells'].values
-        
-        # Replace 0 with small value for log scale
-        dead_values[dead_values == 0] = 1e-6
-        antiviral_values[antiviral_values == 0] = 1e-6
+    if df_ifn10 is not None:
+        # Handle log10 transformation: raise 0 to a small value for log scale, into new
+        # arrays (the DataFrame is left unchanged)
+        dead_values = np.maximum(df_ifn10['Percentage Dead Cells'].values, 1e-6)
+        antiviral_values = np.maximum(df_ifn10['Percentage Antiviral Cells'].values, 1e-6)
         
         # Dead cells - dark red
-        ax.plot(df_ifn10['Time'], dead_values, 
+        ax.plot(*_decimate(df_ifn10['Time'].values, dead_values), 
                color='darkred', linewidth=10, 
                label='IFN10 Dead (with $\mathbf{1\%\ jump}$)', linestyle='-', alpha=0.9)
         
         # Antiviral cells - dark blue
-        ax.plot(df_ifn10['Time'], antiviral_values, 
+        ax.plot(*_decimate(df_ifn10['Time'].values, antiviral_values), 
                color='darkblue', linewidth=10, 
                label='IFN10 Antiviral (with $\mathbf{1\%\ jump}$)', linestyle='-', alpha=0.9)
-        
-    except Exception as e:
-        print(f"Error reading IFN10 file: {e}")
     
     # Plot baseline (no jump)
-    try:
-        df_baseline = pd.read_csv(kjumpr_0_file)
-        
-        # Handle log10 transformation
-        dead_values = df_baseline['Percentage Dead Cells'].values
-        antiviral_values = df_baseline['Percentage Antiviral Cells'].values
-        
-        # Replace 0 with small value for log scale
-        dead_values[dead_values == 0] = 1e-6
-        antiviral_values[antiviral_values == 0] = 1e-6
+    if df_baseline is not None:
+        # Handle log10 transformation: raise 0 to a small value for log scale, into new
+        # arrays (the DataFrame is left unchanged)
+        dead_values = np.maximum(df_baseline['Percentage Dead Cells'].values, 1e-6)
+        antiviral_values = np.maximum(df_baseline['Percentage Antiviral Cells'].values, 1e-6)
         
         # Dead cells - orange
-        ax.plot(df_baseline['Time'], dead_values, 
+        ax.plot(*_decimate(df_baseline['Time'].values, dead_values), 
                color='darkorange', linewidth=12, 
                label='IFN10Dead ($\mathbf{no\ jump}$)', linestyle='--', alpha=0.95)
         
         # Antiviral cells - dark turquoise
-        ax.plot(df_baseline['Time'], antiviral_values, 
+        ax.plot(*_decimate(df_baseline['Time'].values, antiviral_values), 
                color='darkturquoise', linewidth=12, 
                label='IFN10Antiviral ($\mathbf{no\ jump}$)', linestyle='--', alpha=0.95)
-        
-    except Exception as e:
-        print(f"Error reading baseline file: {e}")
     
     # Set log scale for y-axis
     ax.set_yscale('log')
@@ -170,13 +174,9 @@ def create_ifn10_integrated_log10():
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
     
     # Set labels and title
-    ax.set_xlabel('Time (hours)', fontsize=34, fontweight='normal')
-    ax.set_ylabel('Percentage of Cells (%) - Log10 Scale', fontsize=34, fontweight='normal')
-    ax.set_title('IFN10 Only: Dead and Antiviral Cells Dynamics (Log10 Scale)\nComparing 1% Jump vs No Jump', 
-                fontsize=38, fontweight='bold', pad=30)
-    
-    # Set tick label sizes
-    ax.tick_params(axis='both', which='major', labelsize=32)
+    ax.set_xlabel('Time (hours)')
+    ax.set_ylabel('Percentage of Cells (%) - Log10 Scale')
+    ax.set_title('IFN10 Only: Dead and Antiviral Cells Dynamics (Log10 Scale)\nComparing 1% Jump vs No Jump', pad=30)
     
     # Set y-axis limits and ticks for better visualization
     ax.set_ylim([1e-6, 100])
@@ -184,7 +184,7 @@ def create_ifn10_integrated_log10():
     ax.set_yticklabels(['1e-6', '1e-5', '1e-4', '1e-3', '0.01', '0.1', '1', '10', '100'])
     
     # Place legend outside the plot area (to the right)
-    ax.legend(bbox_to_anchor=(1.02, 1), loc='upper left', fontsize=22, 
+    ax.legend(bbox_to_anchor=(1.02, 1), loc='upper left', 
              frameon=True, fancybox=True, shadow=True, ncol=1)
     
     # Add grid for better readability on log scale
@@ -199,69 +199,55 @@ def create_ifn10_integrated_log10():
     
     # Save plot with extra space for legend
     output_filename = 'ifn10_only_integrated_log10_plot.png'
-    plt.savefig(output_filename, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.savefig(output_filename, dpi=save_dpi, bbox_inches='tight', facecolor='white', pil_kwargs=png_kwargs)
     plt.close()
     print(f"Saved: {output_filename}")
 
-def create_ifn10_integrated_dualaxis_linear():
+def create_ifn10_integrated_dualaxis_linear(df_ifn10, df_baseline):
     """Create an integrated IFN10-only plot with dual y-axes: Dead 1–20% (left), Antiviral 1–100% (right)."""
-    
-    # Define the file paths
-    kjumpr_0_file = "kjumpr_0_local_dip_averaged_simulation_output.csv"
-    base_dir = "kjumpr_0.01_vary_ifn_range_local_dip"
-    ifn10_folder = "10_Dinit0_DIPBst50_JRand_Vinit1_VBst100_IFN10_mdbk_times500_tau12_ifnBothFold1.00_grid76_VStimulateIFNtrue"
-    ifn10_file = os.path.join(base_dir, ifn10_folder, "simulation_output.csv")
+    print("\n3. Creating dual-axis linear plot (Dead 1-20%, Antiviral 1-100%)...")
     
     fig, ax_left = plt.subplots(figsize=(20, 12))
     ax_right = ax_left.twinx()
     
     # Plot IFN10 with jump
-    try:
-        df_ifn10 = pd.read_csv(ifn10_file)
+    if df_ifn10 is not None:
         ax_left.plot(
-            df_ifn10['Time'], df_ifn10['Percentage Dead Cells'],
+            *_decimate(df_ifn10['Time'].values, df_ifn10['Percentage Dead Cells'].values),
             color='darkred', linewidth=10, linestyle='-', alpha=0.9,
             label='IFN10 Dead (with $\mathbf{1\%\ jump}$)'
         )
         ax_right.plot(
-            df_ifn10['Time'], df_ifn10['Percentage Antiviral Cells'],
+            *_decimate(df_ifn10['Time'].values, df_ifn10['Percentage Antiviral Cells'].values),
             color='darkblue', linewidth=10, linestyle='-', alpha=0.9,
             label='IFN10 Antiviral (with $\mathbf{1\%\ jump}$)'
         )
-    except Exception as e:
-        print(f"Error reading IFN10 file: {e}")
     
     # Plot baseline (no jump)
-    try:
-        df_baseline = pd.read_csv(kjumpr_0_file)
+    if df_baseline is not None:
         ax_left.plot(
-            df_baseline['Time'], df_baseline['Percentage Dead Cells'],
+            *_decimate(df_baseline['Time'].values, df_baseline['Percentage Dead Cells'].values),
             color='darkorange', linewidth=12, linestyle='--', alpha=0.95,
             label='IFN10Dead ($\mathbf{no\ jump}$)'
         )
         ax_right.plot(
-            df_baseline['Time'], df_baseline['Percentage Antiviral Cells'],
+            *_decimate(df_baseline['Time'].values, df_baseline['Percentage Antiviral Cells'].values),
             color='darkturquoise', linewidth=12, linestyle='--', alpha=0.95,
             label='IFN10Antiviral ($\mathbf{no\ jump}$)'
         )
-    except Exception as e:
-        print(f"Error reading baseline file: {e}")
     
     # Axes labels and ranges
-    ax_left.set_xlabel('Time (hours)', fontsize=34, fontweight='normal')
-    ax_left.set_ylabel('Percentage Dead Cells (%)', fontsize=34, color='darkred')
-    ax_right.set_ylabel('Percentage Antiviral Cells (%)', fontsize=34, color='darkblue', rotation=270, labelpad=20)
+    ax_left.set_xlabel('Time (hours)')
+    ax_left.set_ylabel('Percentage Dead Cells (%)', color='darkred')
+    ax_right.set_ylabel('Percentage Antiviral Cells (%)', color='darkblue', rotation=270, labelpad=20)
     
     ax_left.set_ylim(1, 20)
     ax_right.set_ylim(1, 100)
     
-    ax_left.tick_params(axis='both', which='major', labelsize=32, colors='black')
-    ax_right.tick_params(axis='y', labelsize=32, colors='black')
-    
     # Title
     ax_left.set_title(
         'IFN10 Only: Dead (1–20%) and Antiviral (1–100%)\nDual Y-axes, Comparing 1% Jump vs No Jump',
-        fontsize=38, fontweight='bold', pad=30
+        pad=30
     )
     
     # Grid and background
@@ -276,107 +262,74 @@ def create_ifn10_integrated_dualaxis_linear():
     
     ax_left.legend(
         lines, labels,
-        bbox_to_anchor=(1.02, 1), loc='upper left', fontsize=22,
+        bbox_to_anchor=(1.02, 1), loc='upper left',
         frameon=True, fancybox=True, shadow=True, ncol=1
     )
     
     plt.tight_layout()
     output_filename = 'ifn10_only_integrated_dualaxis_linear_plot.png'
-    plt.savefig(output_filename, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.savefig(output_filename, dpi=save_dpi, bbox_inches='tight', facecolor='white', pil_kwargs=png_kwargs)
     plt.close()
     print(f"Saved: {output_filename}")
 
-def create_ifn1_to_ifn10_dualaxis_linear():
+def create_ifn1_to_ifn10_dualaxis_linear(ifn_runs, df_baseline):
     """Create a dual y-axis linear plot for IFN1–IFN10: Dead 1–30% (left), Antiviral 1–100% (right)."""
-    base_dir = "kjumpr_0.01_vary_ifn_range_local_dip"
-    kjumpr_0_file = "kjumpr_0_local_dip_averaged_simulation_output.csv"
-
-    # Collect files and labels
-    ifn_files = []
-    ifn_labels = []
-    for i in range(1, 11):
-        folder = f"{i}_Dinit0_DIPBst50_JRand_Vinit1_VBst100_IFN{i}_mdbk_times500_tau12_ifnBothFold1.00_grid76_VStimulateIFNtrue"
-        csv_path = os.path.join(base_dir, folder, "simulation_output.csv")
-        if os.path.exists(csv_path):
-            ifn_files.append(csv_path)
-            ifn_labels.append(f"IFN{i}")
-        else:
-            print(f"Warning: {csv_path} not found")
+    print("\n4. Creating IFN1–IFN10 dual-axis linear plot...")
 
     fig, ax_left = plt.subplots(figsize=(20, 12))
     ax_right = ax_left.twinx()
 
-    # Color gradients: IFN1 lightest -> IFN10 darkest
-    dead_colors = []  # red gradient
-    anti_colors = []  # blue gradient
-    for i in range(10):
-        intensity = 0.2 + (i * 0.05)  # 0.2..0.65 for better blue gradient visibility
-        # Mistyrose to red gradient for dead cells
-        # Mistyrose RGB: (1.0, 0.894, 0.882), Red RGB: (1.0, 0.0, 0.0)
-        # Linear interpolation from mistyrose (IFN1) to red (IFN10)
-        t = i / 9.0  # 0 for IFN1, 1 for IFN10
-        r = 1.0 * (1 - t) + 1.0 * t  # Always 1.0
-        g = 0.894 * (1 - t) + 0.0 * t
-        b = 0.882 * (1 - t) + 0.0 * t
-        dead_colors.append((r, g, b))
-        # Alice blue to blue gradient
-        # Alice blue RGB: (0.941, 0.973, 1.0), Blue RGB: (0.0, 0.0, 1.0)
-        # Linear interpolation from alice blue (IFN1) to blue (IFN10)
-        t = i / 9.0  # 0 for IFN1, 1 for IFN10
-        r = 0.941 * (1 - t) + 0.0 * t
-        g = 0.973 * (1 - t) + 0.0 * t
-        b = 1.0 * (1 - t) + 1.0 * t  # Always 1.0
-        anti_colors.append((r, g, b))
+    # Color gradients: IFN1 lightest -> IFN10 darkest, linear interpolation per RGB channel
+    t = np.linspace(0, 1, 10)[:, None]  # 0 for IFN1, 1 for IFN10
+    # Mistyrose (1.0, 0.894, 0.882) to red (1.0, 0.0, 0.0) for dead cells
+    dead_colors = (1 - t) * np.array([1.0, 0.894, 0.882]) + t * np.array([1.0, 0.0, 0.0])
+    # Alice blue (0.941, 0.973, 1.0) to blue (0.0, 0.0, 1.0) for antiviral cells
+    anti_colors = (1 - t) * np.array([0.941, 0.973, 1.0]) + t * np.array([0.0, 0.0, 1.0])
 
     # Plot each IFN (thinner lines for red/blue) - no individual labels
-    for idx, (csv_path, label) in enumerate(zip(ifn_files, ifn_labels)):
-        try:
-            df = pd.read_csv(csv_path)
+    # ifn_runs holds one DataFrame per existing run file in IFN order (None if it could not be read)
+    for idx, df in enumerate(ifn_runs):
+        if df is not None:
             ax_left.plot(
-                df['Time'], df['Percentage Dead Cells'],
+                *_decimate(df['Time'].values, df['Percentage Dead Cells'].values),
                 color=dead_colors[idx], linewidth=3, linestyle='-', alpha=0.9
             )
             ax_right.plot(
-                df['Time'], df['Percentage Antiviral Cells'],
+                *_decimate(df['Time'].values, df['Percentage Antiviral Cells'].values),
                 color=anti_colors[idx], linewidth=3, linestyle='-', alpha=0.9
             )
-        except Exception as e:
-            print(f"Error reading {csv_path}: {e}")
 
     # Add baseline (no jump): orange and sky-blue (keep widths) - with labels
     baseline_dead_line = None
     baseline_anti_line = None
-    try:
-        df_baseline = pd.read_csv(kjumpr_0_file)
+    if df_baseline is not None:
         baseline_dead_line = ax_left.plot(
-            df_baseline['Time'], df_baseline['Percentage Dead Cells'],
+            *_decimate(df_baseline['Time'].values, df_baseline['Percentage Dead Cells'].values),
             color='darkorange', linewidth=10, linestyle='-', alpha=0.95,
             label='IFN10Dead ($\mathbf{no\ jump}$)'
         )[0]
         baseline_anti_line = ax_right.plot(
-            df_baseline['Time'], df_baseline['Percentage Antiviral Cells'],
+            *_decimate(df_baseline['Time'].values, df_baseline['Percentage Antiviral Cells'].values),
             color='darkturquoise', linewidth=10, linestyle='-', alpha=0.95,
             label='IFN10Antiviral ($\mathbf{no\ jump}$)'
         )[0]
-    except Exception as e:
-        print(f"Error reading baseline file: {e}")
 
     # Axes labels and ranges
-    ax_left.set_xlabel('Time (hours)', fontsize=34, fontweight='normal')
-    ax_left.set_ylabel('Percentage Dead Cells (%)', fontsize=34, color='darkred')
-    ax_right.set_ylabel('Percentage Antiviral Cells (%)', fontsize=34, color='darkblue', rotation=270, labelpad=20)
+    ax_left.set_xlabel('Time (hours)')
+    ax_left.set_ylabel('Percentage Dead Cells (%)', color='darkred')
+    ax_right.set_ylabel('Percentage Antiviral Cells (%)', color='darkblue', rotation=270, labelpad=20)
 
     # Per request: left axis fixed to 1–30, right axis 1–100
     ax_left.set_ylim(1, 30)
     ax_right.set_ylim(1, 100)
 
-    ax_left.tick_params(axis='both', which='major', labelsize=30, colors='black')
-    ax_right.tick_params(axis='y', labelsize=30, colors='black')
+    ax_left.tick_params(axis='both', which='major', labelsize=30)
+    ax_right.tick_params(axis='y', labelsize=30)
 
     # Title
     ax_left.set_title(
         'IFN1–IFN10: Dead (1–30%) and Antiviral (1–100%)\nDual Y-axes (Linear) with Baseline',
-        fontsize=38, fontweight='bold', pad=26
+        pad=26
     )
 
     # Grid and background
@@ -415,18 +368,30 @@ def create_ifn1_to_ifn10_dualaxis_linear():
 
     plt.tight_layout()
     output_filename = 'ifn1_to_ifn10_integrated_dualaxis_linear_plot.png'
-    plt.savefig(output_filename, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.savefig(output_filename, dpi=save_dpi, bbox_inches='tight', facecolor='white', pil_kwargs=png_kwargs)
     plt.close()
     print(f"Saved: {output_filename}")
 
 if __name__ == "__main__":
     print("Generating IFN10-only plots...")
-    print("\n1. Creating linear scale plot...")
-    create_ifn10_integrated_linear()
-    print("\n2. Creating log10 scale plot...")
-    create_ifn10_integrated_log10()
-    print("\n3. Creating dual-axis linear plot (Dead 1-20%, Antiviral 1-100%)...")
-    create_ifn10_integrated_dualaxis_linear()
-    print("\n4. Creating IFN1–IFN10 dual-axis linear plot...")
-    create_ifn1_to_ifn10_dualaxis_linear()
+    # Every CSV is parsed once here; the plots get the parsed columns
+    df_baseline = load_csv(kjumpr_0_file, "baseline file")
+    ifn_runs = {}
+    for i in range(1, 11):
+        csv_path = ifn_run_file(i)
+        if os.path.exists(csv_path):
+            ifn_runs[i] = load_csv(csv_path, csv_path)
+        else:
+            print(f"Warning: {csv_path} not found")
+    df_ifn10 = ifn_runs.get(10)
+    # The plots share no other state, so each one is rendered in its own worker process
+    with ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+        futures = [
+            executor.submit(create_ifn10_integrated_linear, df_ifn10, df_baseline),
+            executor.submit(create_ifn10_integrated_log10, df_ifn10, df_baseline),
+            executor.submit(create_ifn10_integrated_dualaxis_linear, df_ifn10, df_baseline),
+            executor.submit(create_ifn1_to_ifn10_dualaxis_linear, list(ifn_runs.values()), df_baseline),
+        ]
+        for future in futures:
+            future.result()  # re-raises an error from the plot's worker
     print("\nAll IFN10-only plots generated successfully!")